@@ -485,14 +485,23 @@ class ChatAPI:
         }
 
 
-class BrowserController:
+class BrowserController(QObject):
     """Main controller for the browser API."""
     
+    # Emitted when the set of tabs, their order or the current tab may have changed
+    tabs_changed = pyqtSignal()
+    
     def __init__(self, browser_window: BrowserWindow):
+        super().__init__()
         self.browser_window = browser_window
         self.browser_api = BrowserAPI(browser_window)
         self.terminal_api = TerminalAPI(browser_window)
         self.chat_api = ChatAPI(browser_window)
+        
+        # Tabs added, closed or switched in the UI change the current index or the tab order
+        tab_widget = browser_window.tab_widget
+        tab_widget.currentChanged.connect(lambda index: self.tabs_changed.emit())
+        tab_widget.tabBar().tabMoved.connect(lambda from_index, to_index: self.tabs_changed.emit())
     
     def switch_to_tab(self, tab_index: int) -> Dict[str, Any]:
         """Switch to a specific tab."""
@@ -500,6 +509,7 @@ class BrowserController:
             return {"error": f"Tab index {tab_index} out of range"}
         
         self.browser_window.tab_widget.setCurrentIndex(tab_index)
+        self.tabs_changed.emit()
         
         current_tab = self.browser_window.current_tab()
         tab_type = "unknown"
@@ -545,15 +555,18 @@ class BrowserController:
         """Create a new tab of the specified type."""
         if tab_type.lower() == "browser":
             tab = self.browser_window.add_new_tab()
-            return {"tab_index": self.browser_window.tab_widget.indexOf(tab), "tab_type": "BROWSER"}
+            result = {"tab_index": self.browser_window.tab_widget.indexOf(tab), "tab_type": "BROWSER"}
         elif tab_type.lower() == "chat":
             tab = self.browser_window.add_new_chat_tab()
-            return {"tab_index": self.browser_window.tab_widget.indexOf(tab), "tab_type": "CHAT"}
+            result = {"tab_index": self.browser_window.tab_widget.indexOf(tab), "tab_type": "CHAT"}
         elif tab_type.lower() == "terminal":
             tab = self.browser_window.add_new_terminal_tab()
-            return {"tab_index": self.browser_window.tab_widget.indexOf(tab), "tab_type": "TERMINAL"}
+            result = {"tab_index": self.browser_window.tab_widget.indexOf(tab), "tab_type": "TERMINAL"}
         else:
             return {"error": f"Unknown tab type: {tab_type}"}
+        
+        self.tabs_changed.emit()
+        return result
     
     def close_tab(self, tab_index: int) -> Dict[str, Any]:
         """Close a specific tab."""
@@ -561,6 +574,7 @@ class BrowserController:
             return {"error": f"Tab index {tab_index} out of range"}
         
         self.browser_window.close_tab(tab_index)
+        self.tabs_changed.emit()
         
         return {
             "closed_tab_index": tab_index,
@@ -576,15 +590,19 @@ class BrowserController:
         elif command == "fill_input":
             return self.browser_api.fill_input(**kwargs)
         elif command == "navigate":
-            return self.browser_api.navigate(**kwargs)
+            result = self.browser_api.navigate(**kwargs)
         elif command == "go_back":
-            return self.browser_api.go_back()
+            result = self.browser_api.go_back()
         elif command == "go_forward":
-            return self.browser_api.go_forward()
+            result = self.browser_api.go_forward()
         elif command == "refresh":
-            return self.browser_api.refresh()
+            result = self.browser_api.refresh()
         else:
             return {"error": f"Unknown browser command: {command}"}
+        
+        # Navigation changes the URL and title reported by get_tabs_info
+        self.tabs_changed.emit()
+        return result
     
     def execute_terminal_command(self, command: str, **kwargs) -> Dict[str, Any]:
         """Execute a terminal command."""
@@ -123,6 +123,9 @@ class BrowserWindow(QMainWindow):
         # script_path parameter kept for compatibility but not used
         self.start_url = start_url or "https://www.google.com"
         
+        # Open chat tabs, kept so sessions can be saved without walking the tab widget
+        self._chat_tabs = []
+        
         # Initialize session manager for auto-loading previous session
         self.session_manager = SessionManager(self)
         
@@ -338,6 +341,7 @@ class BrowserWindow(QMainWindow):
     def add_new_chat_tab(self):
         """Add a new AI chat tab."""
         tab = AIChatTab(self)
+        self._chat_tabs.append(tab)
         index = self.tab_widget.addTab(tab, "AI Chat")
         self.tab_widget.setCurrentIndex(index)
         return tab
@@ -392,9 +396,10 @@ class BrowserWindow(QMainWindow):
             
             # Special handling for terminal tabs
             if hasattr(tab, 'tab_type') and tab.tab_type == TabType.TERMINAL:
-                # Make sure to terminate any running processes
-                if hasattr(tab, 'process') and tab.process:
-                    tab.process.terminate()
+                # Stop the shell and release its pty; it won't be restarted
+                tab.shutdown()
+            elif tab in self._chat_tabs:
+                self._chat_tabs.remove(tab)
             
             self.tab_widget.removeTab(index)
         else:
@@ -650,7 +655,8 @@ class BrowserWindow(QMainWindow):
         """Handle window close event."""
         # Save the current session before closing
         try:
-            self.session_manager.save_session(self)
+            # Block until the files are written; the process is about to exit
+            self.session_manager.save_session(self, wait=True)
         except Exception as e:
             print(f"Error saving session: {e}")
         
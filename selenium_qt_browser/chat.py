@@ -17,6 +17,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont, QTextCursor, QColor
 
+from selenium_qt_browser.tab_types import TabType
+
 class ChatMessage(QFrame):
     """A single chat message widget."""
     
@@ -44,7 +46,8 @@ class ChatMessage(QFrame):
         sender_label.setStyleSheet("font-weight: bold;")
         
         # Create timestamp with explicit styling
-        timestamp = QLabel(datetime.now().strftime('%H:%M:%S'))
+        self.timestamp = datetime.now().strftime('%H:%M:%S')
+        timestamp = QLabel(self.timestamp)
         timestamp.setStyleSheet("font-size: 9pt;")
         timestamp.setAlignment(Qt.AlignmentFlag.AlignRight)
         
@@ -64,6 +67,8 @@ class AIChatTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        self.tab_type = TabType.CHAT
+        self._messages = []  # Plain-data copy of the conversation, used for saving sessions
         self.setup_ui()
         
         # Initialize with a welcome message
@@ -113,10 +118,23 @@ class AIChatTab(QWidget):
         """Add a message to the chat area."""
         message_widget = ChatMessage(sender, message, self)
         self.chat_layout.addWidget(message_widget)
+        self._messages.append({
+            "sender": sender,
+            "message": message,
+            "timestamp": message_widget.timestamp
+        })
         
         # Scroll to the bottom
         QTimer.singleShot(100, lambda: self.parent.scroll_to_bottom(self.chat_area))
     
+    def clear_messages(self):
+        """Remove all messages from the chat area."""
+        while self.chat_layout.count() > 0:
+            item = self.chat_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        self._messages.clear()
+    
     def send_message(self):
         """Send a user message and get AI responses."""
         message = self.message_input.text().strip()
@@ -9,11 +9,17 @@ It includes real-time graphing and resource management controls.
 
 import os
 import sys
+import gc
 import time
+import atexit
+import heapq
+import random
 import threading
+import subprocess
 import json
 import logging
-from datetime import datetime
+from enum import IntEnum
+from importlib.metadata import distribution, PackageNotFoundError
 from typing import Dict, List, Optional, Tuple, Any, Union
 
 import psutil
@@ -23,6 +29,15 @@ try:
 except ImportError:
     HAS_TORCH = False
 
+# Private CUDA memory pools (torch >= 2.5) let a model's memory be released as a whole
+HAS_MEMPOOL = HAS_TORCH and hasattr(torch.cuda, "MemPool") and hasattr(torch.cuda, "use_mem_pool")
+
+try:
+    import pynvml
+    HAS_NVML = True
+except ImportError:
+    HAS_NVML = False
+
 try:
     import GPUtil
     HAS_GPUTIL = True
@@ -30,14 +45,21 @@ except ImportError:
     HAS_GPUTIL = False
 
 try:
-    from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject
+    import numpy as np
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QObject, QCoreApplication, QLineF, QRect, QPointF
     from PyQt6.QtWidgets import (
         QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
         QComboBox, QTabWidget, QSlider, QProgressBar, QGroupBox,
         QCheckBox, QSpinBox, QDoubleSpinBox, QFrame, QSplitter,
         QScrollArea, QSizePolicy
     )
-    from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QBrush, QLinearGradient, QGradient
+    from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QBrush, QLinearGradient, QGradient, QPixmap, QPolygonF
     HAS_PYQT = True
 except ImportError:
     HAS_PYQT = False
@@ -47,12 +69,16 @@ logger = logging.getLogger(__name__)
 
 # Constants
 UPDATE_INTERVAL_MS = 1000  # Update interval in milliseconds
+PAINT_INTERVAL_MS = 33  # Repaint interval in milliseconds (~30 FPS cap)
 HISTORY_LENGTH = 60  # Number of data points to keep in history (60 seconds)
+LONG_HISTORY_K = 240  # Number of samples kept in the long-view reservoir
+CACHE_RELEASE_FRACTION = 0.8  # Empty the CUDA cache on unload only above this share of device memory
 COLORS = {
     "cpu": "#4e79a7",
     "ram": "#f28e2c",
     "gpu": "#e15759",
     "vram": "#76b7b2",
+    "process": "#b07aa1",
     "background": "#f9f9f9",
     "grid": "#dddddd",
     "text": "#333333",
@@ -60,55 +86,172 @@ COLORS = {
     "good": "#59a14f"
 }
 
+
+class C(IntEnum):
+    """Indices into the pre-parsed color tuple _QC."""
+    BG = 0
+    GRID = 1
+    TEXT = 2
+    CPU = 3
+    RAM = 4
+    GPU = 5
+    VRAM = 6
+    WARN = 7
+    GOOD = 8
+    PROCESS = 9
+
+
+# Pre-parsed colors and pens so the paint path never converts hex strings or
+# hashes color names
+if HAS_PYQT:
+    _QC = tuple(QColor(COLORS[name]) for name in (
+        "background", "grid", "text", "cpu", "ram", "gpu", "vram", "warning", "good", "process"
+    ))
+    _BRUSH_BG = QBrush(_QC[C.BG])
+    _PEN_GRID = QPen(_QC[C.GRID], 1, Qt.PenStyle.DotLine)
+    _PEN_GAUGE_TRACK = QPen(_QC[C.GRID], 10, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+
+
+_nvml_initialized = False
+
+
+def _init_nvml():
+    """Initialize NVML once per process and register its shutdown."""
+    global _nvml_initialized
+    if not _nvml_initialized:
+        pynvml.nvmlInit()
+        atexit.register(pynvml.nvmlShutdown)
+        _nvml_initialized = True
+
+
 class ResourceData:
     """Class to store and manage resource usage data."""
     
-    def __init__(self, history_length: int = HISTORY_LENGTH):
+    __slots__ = (
+        "history_length", "long_history_k", "_nvml_handles", "_nvml_names", "_nvml_total_memory",
+        "_proc", "_cpu_count", "ram_total",
+        "_t0", "timestamps", "cpu_usage", "ram_usage", "proc_cpu_usage", "proc_ram_usage",
+        "gpu_usage", "gpu_memory", "gpu_total_memory", "gpu_names", "gpu_temperatures",
+        "model_memory", "model_reserved", "model_device_total", "model_memory_long",
+        "_model_memory_reservoir", "_model_memory_seq",
+        "model_loaded", "model_device", "model_precision", "model_name", "_model_dev_idx",
+    )
+    
+    def __init__(self, history_length: int = HISTORY_LENGTH, long_history_k: int = LONG_HISTORY_K):
         self.history_length = history_length
+        self.long_history_k = long_history_k
+        self._nvml_handles = []
+        
+        # Process-scoped metrics; the first cpu_percent call only primes the counter
+        self._proc = psutil.Process()
+        self._proc.cpu_percent(None)
+        self._cpu_count = psutil.cpu_count() or 1
+        self.ram_total: float = psutil.virtual_memory().total / (1024 ** 3)  # GB
+        
         self.reset()
+        
+        if HAS_NVML:
+            try:
+                self._setup_nvml()
+            except Exception as e:
+                logger.warning(f"NVML unavailable, falling back to GPUtil: {e}")
+                self._nvml_handles = []
+    
+    def _setup_nvml(self):
+        """Cache NVML device handles and static device properties."""
+        _init_nvml()
+        device_count = pynvml.nvmlDeviceGetCount()
+        self._nvml_handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(device_count)]
+        
+        names = []
+        for handle in self._nvml_handles:
+            name = pynvml.nvmlDeviceGetName(handle)
+            names.append(name.decode() if isinstance(name, bytes) else name)
+        self._nvml_names = names
+        self._nvml_total_memory = [
+            pynvml.nvmlDeviceGetMemoryInfo(handle).total / (1024 ** 3)  # GB
+            for handle in self._nvml_handles
+        ]
+        self._init_gpu_lists()
+    
+    def _init_gpu_lists(self):
+        """Initialize per-GPU lists from the cached NVML device properties."""
+        self.gpu_names = list(self._nvml_names)
+        self.gpu_total_memory = list(self._nvml_total_memory)
+        self.gpu_usage = [() for _ in self._nvml_handles]
+        self.gpu_memory = [() for _ in self._nvml_handles]
+        self.gpu_temperatures = [() for _ in self._nvml_handles]
     
     def reset(self):
         """Reset all data."""
-        self.timestamps: List[datetime] = []
-        self.cpu_usage: List[float] = []
-        self.ram_usage: List[float] = []
-        self.ram_total: float = 0
-        self.gpu_usage: List[List[float]] = []  # List of lists for multiple GPUs
-        self.gpu_memory: List[List[float]] = []  # List of lists for multiple GPUs
+        # History series are immutable tuples that are replaced on every update,
+        # so the GUI thread can hold references to them while sampling continues.
+        # Timestamps are monotonic seconds since reset(), immune to wall-clock jumps
+        self._t0 = time.monotonic()
+        self.timestamps: Tuple[float, ...] = ()
+        self.cpu_usage: Tuple[float, ...] = ()
+        self.ram_usage: Tuple[float, ...] = ()
+        self.proc_cpu_usage: Tuple[float, ...] = ()  # CPU used by this process
+        self.proc_ram_usage: Tuple[float, ...] = ()  # RSS of this process
+        self.gpu_usage: List[Tuple[float, ...]] = []  # One series per GPU
+        self.gpu_memory: List[Tuple[float, ...]] = []  # One series per GPU
         self.gpu_total_memory: List[float] = []  # Total memory for each GPU
         self.gpu_names: List[str] = []
-        self.gpu_temperatures: List[List[float]] = []  # List of lists for multiple GPUs
-        self.model_memory: List[float] = []  # Memory used by the model
+        self.gpu_temperatures: List[Tuple[float, ...]] = []  # One series per GPU
+        self.model_memory: Tuple[float, ...] = ()  # Memory allocated by the model
+        self.model_reserved: Tuple[float, ...] = ()  # Memory reserved by the caching allocator
+        self.model_device_total: float = 0  # Total memory of the model's device
+        # Long-view model memory: a uniform random sample of every tick taken while
+        # a model was loaded, bounded to long_history_k entries, in time order
+        self.model_memory_long: Tuple[float, ...] = ()
+        self._model_memory_reservoir: List[Tuple[float, int, float]] = []  # (priority, seq, value) min-heap
+        self._model_memory_seq = 0
         self.model_loaded = False
         self.model_device = "N/A"
+        self._model_dev_idx: Optional[int] = None
         self.model_precision = "N/A"
         self.model_name = "N/A"
+        
+        if self._nvml_handles:
+            self._init_gpu_lists()
+    
+    def _append(self, series: Tuple, value) -> Tuple:
+        """Return a copy of series with value appended, trimmed to the history length."""
+        return (series + (value,))[-self.history_length:]
     
     def update(self):
         """Update resource usage data."""
-        now = datetime.now()
-        
         # Add new timestamp
-        self.timestamps.append(now)
-        if len(self.timestamps) > self.history_length:
-            self.timestamps.pop(0)
+        self.timestamps = self._append(self.timestamps, time.monotonic() - self._t0)
         
         # CPU usage
         cpu_percent = psutil.cpu_percent(interval=None)
-        self.cpu_usage.append(cpu_percent)
-        if len(self.cpu_usage) > self.history_length:
-            self.cpu_usage.pop(0)
+        self.cpu_usage = self._append(self.cpu_usage, cpu_percent)
         
         # RAM usage
-        memory = psutil.virtual_memory()
-        self.ram_total = memory.total / (1024 ** 3)  # GB
-        ram_used = memory.used / (1024 ** 3)  # GB
-        self.ram_usage.append(ram_used)
-        if len(self.ram_usage) > self.history_length:
-            self.ram_usage.pop(0)
+        ram_used = psutil.virtual_memory().used / (1024 ** 3)  # GB
+        self.ram_usage = self._append(self.ram_usage, ram_used)
+        
+        # Process CPU and RAM usage (normalized to the same 0-100% scale as the system)
+        proc_cpu = self._proc.cpu_percent(None) / self._cpu_count
+        proc_rss = self._proc.memory_info().rss / (1024 ** 3)  # GB
+        self.proc_cpu_usage = self._append(self.proc_cpu_usage, proc_cpu)
+        self.proc_ram_usage = self._append(self.proc_ram_usage, proc_rss)
         
         # GPU usage (if available)
-        if HAS_GPUTIL:
+        if self._nvml_handles:
+            try:
+                for i, handle in enumerate(self._nvml_handles):
+                    util = pynvml.nvmlDeviceGetUtilizationRates(handle)
+                    meminfo = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                    temperature = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
+                    
+                    self.gpu_usage[i] = self._append(self.gpu_usage[i], util.gpu)
+                    self.gpu_memory[i] = self._append(self.gpu_memory[i], meminfo.used / (1024 ** 3))  # GB
+                    self.gpu_temperatures[i] = self._append(self.gpu_temperatures[i], temperature)
+            except Exception as e:
+                logger.warning(f"Error updating GPU data: {e}")
+        elif HAS_GPUTIL:
             try:
                 gpus = GPUtil.getGPUs()
                 
@@ -116,54 +259,85 @@ class ResourceData:
                 if not self.gpu_names:
                     self.gpu_names = [gpu.name for gpu in gpus]
                     self.gpu_total_memory = [gpu.memoryTotal / 1024 for gpu in gpus]  # GB
-                    self.gpu_usage = [[] for _ in gpus]
-                    self.gpu_memory = [[] for _ in gpus]
-                    self.gpu_temperatures = [[] for _ in gpus]
+                    self.gpu_usage = [() for _ in gpus]
+                    self.gpu_memory = [() for _ in gpus]
+                    self.gpu_temperatures = [() for _ in gpus]
                 
                 # Update GPU data
                 for i, gpu in enumerate(gpus):
-                    self.gpu_usage[i].append(gpu.load * 100)  # Convert to percentage
-                    self.gpu_memory[i].append(gpu.memoryUsed / 1024)  # GB
-                    self.gpu_temperatures[i].append(gpu.temperature)
-                    
-                    # Trim lists if they exceed history length
-                    if len(self.gpu_usage[i]) > self.history_length:
-                        self.gpu_usage[i].pop(0)
-                    if len(self.gpu_memory[i]) > self.history_length:
-                        self.gpu_memory[i].pop(0)
-                    if len(self.gpu_temperatures[i]) > self.history_length:
-                        self.gpu_temperatures[i].pop(0)
+                    self.gpu_usage[i] = self._append(self.gpu_usage[i], gpu.load * 100)  # Convert to percentage
+                    self.gpu_memory[i] = self._append(self.gpu_memory[i], gpu.memoryUsed / 1024)  # GB
+                    self.gpu_temperatures[i] = self._append(self.gpu_temperatures[i], gpu.temperature)
             except Exception as e:
                 logger.warning(f"Error updating GPU data: {e}")
         
-        # PyTorch GPU usage (more accurate for model memory)
-        if HAS_TORCH and torch.cuda.is_available():
+        # PyTorch GPU usage (more accurate for model memory), only for the model's device
+        if self.model_loaded and self._model_dev_idx is not None:
             try:
-                # Update model memory usage if model is loaded
-                if self.model_loaded:
-                    model_memory = 0
-                    for i in range(torch.cuda.device_count()):
-                        model_memory += torch.cuda.memory_allocated(i) / (1024 ** 3)  # GB
-                    self.model_memory.append(model_memory)
-                    if len(self.model_memory) > self.history_length:
-                        self.model_memory.pop(0)
+                allocated = torch.cuda.memory_allocated(self._model_dev_idx) / (1024 ** 3)  # GB
+                reserved = torch.cuda.memory_reserved(self._model_dev_idx) / (1024 ** 3)  # GB
+                self.model_memory = self._append(self.model_memory, allocated)
+                self.model_reserved = self._append(self.model_reserved, reserved)
+                self._sample_long_history(allocated)
             except Exception as e:
                 logger.warning(f"Error updating PyTorch GPU data: {e}")
     
+    def _sample_long_history(self, value: float):
+        """Add a model memory sample to the bounded long-view reservoir.
+        
+        Each sample gets a random priority and only the long_history_k highest
+        priorities are kept (Vitter-style reservoir over a min-heap), so memory
+        stays O(k) however long the session runs.
+        """
+        item = (random.random(), self._model_memory_seq, value)
+        self._model_memory_seq += 1
+        if len(self._model_memory_reservoir) < self.long_history_k:
+            heapq.heappush(self._model_memory_reservoir, item)
+        else:
+            heapq.heappushpop(self._model_memory_reservoir, item)
+        
+        self.model_memory_long = tuple(
+            value for _, _, value in sorted(self._model_memory_reservoir, key=lambda entry: entry[1])
+        )
+    
+    @staticmethod
+    def _parse_cuda_index(device: str) -> Optional[int]:
+        """Return the CUDA device index for a device string such as "cuda:1", or None."""
+        device = device.lower()
+        if device.startswith("cuda"):
+            _, _, index = device.partition(":")
+            return int(index) if index.isdigit() else 0
+        if device == "gpu":
+            return 0
+        return None
+    
     def set_model_info(self, loaded: bool, device: str, precision: str, name: str):
         """Set information about the loaded model."""
         self.model_loaded = loaded
         self.model_device = device
         self.model_precision = precision
         self.model_name = name
+        
+        self._model_dev_idx = None
+        self.model_device_total = 0
+        if loaded and HAS_TORCH and torch.cuda.is_available():
+            self._model_dev_idx = self._parse_cuda_index(device)
+            if self._model_dev_idx is not None:
+                try:
+                    _, total = torch.cuda.mem_get_info(self._model_dev_idx)
+                    self.model_device_total = total / (1024 ** 3)  # GB
+                except Exception as e:
+                    logger.warning(f"Error reading model device memory: {e}")
     
     def get_latest(self) -> Dict[str, Any]:
         """Get the latest resource usage data."""
         result = {
-            "timestamp": self.timestamps[-1] if self.timestamps else datetime.now(),
+            "timestamp": self.timestamps[-1] if self.timestamps else 0.0,
             "cpu_usage": self.cpu_usage[-1] if self.cpu_usage else 0,
             "ram_usage": self.ram_usage[-1] if self.ram_usage else 0,
             "ram_total": self.ram_total,
+            "proc_cpu_usage": self.proc_cpu_usage[-1] if self.proc_cpu_usage else 0,
+            "proc_ram_usage": self.proc_ram_usage[-1] if self.proc_ram_usage else 0,
             "gpu_count": len(self.gpu_names),
             "gpu_names": self.gpu_names,
             "gpu_usage": [usage[-1] if usage else 0 for usage in self.gpu_usage],
@@ -171,6 +345,8 @@ class ResourceData:
             "gpu_total_memory": self.gpu_total_memory,
             "gpu_temperatures": [temp[-1] if temp else 0 for temp in self.gpu_temperatures],
             "model_memory": self.model_memory[-1] if self.model_memory else 0,
+            "model_reserved": self.model_reserved[-1] if self.model_reserved else 0,
+            "model_device_total": self.model_device_total,
             "model_loaded": self.model_loaded,
             "model_device": self.model_device,
             "model_precision": self.model_precision,
@@ -185,6 +361,8 @@ class ResourceData:
             "cpu_usage": self.cpu_usage,
             "ram_usage": self.ram_usage,
             "ram_total": self.ram_total,
+            "proc_cpu_usage": self.proc_cpu_usage,
+            "proc_ram_usage": self.proc_ram_usage,
             "gpu_count": len(self.gpu_names),
             "gpu_names": self.gpu_names,
             "gpu_usage": self.gpu_usage,
@@ -192,6 +370,9 @@ class ResourceData:
             "gpu_total_memory": self.gpu_total_memory,
             "gpu_temperatures": self.gpu_temperatures,
             "model_memory": self.model_memory,
+            "model_reserved": self.model_reserved,
+            "model_memory_long": self.model_memory_long,
+            "model_device_total": self.model_device_total,
             "model_loaded": self.model_loaded,
             "model_device": self.model_device,
             "model_precision": self.model_precision,
@@ -201,29 +382,79 @@ class ResourceData:
 
 
 class ResourceMonitor(QObject):
-    """Class to monitor system resources."""
+    """Class to monitor system resources.
+    
+    Sampling runs on a dedicated worker thread so that slow psutil, NVML or
+    CUDA queries never stall the GUI event loop. Samples reach the GUI through
+    the data_updated signal, which Qt queues across the thread boundary.
+    """
     
     data_updated = pyqtSignal(dict)
+    # Requests to the worker thread; queued, so the GUI thread never waits on a sample
+    _timer_start_requested = pyqtSignal(int)
+    _timer_stop_requested = pyqtSignal()
+    _shutdown_requested = pyqtSignal()
     
-    def __init__(self, parent=None):
-        super().__init__(parent)
+    def __init__(self):
+        # No parent: an object with a parent cannot be moved to another thread
+        super().__init__()
         self.data = ResourceData()
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_data)
+        self.timer = None
         self.running = False
+        self._interval_ms = UPDATE_INTERVAL_MS
+        
+        self._thread = QThread()
+        self.moveToThread(self._thread)
+        self._timer_start_requested.connect(self._start_timer)
+        self._timer_stop_requested.connect(self._stop_timer)
+        self._shutdown_requested.connect(self._shutdown)
+        
+        # Join the worker before the application tears down Qt
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop, Qt.ConnectionType.DirectConnection)
+    
+    def _start_timer(self, interval_ms: int):
+        """Create the sampling timer if needed and (re)start it (runs on the worker thread)."""
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.timeout.connect(self.update_data)
+        self.timer.start(interval_ms)
+    
+    def _stop_timer(self):
+        """Pause sampling, keeping the worker thread alive (runs on the worker thread)."""
+        if self.timer is not None:
+            self.timer.stop()
+    
+    def _shutdown(self):
+        """Drop the sampling timer and leave the worker event loop (runs on the worker thread)."""
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer.deleteLater()
+            self.timer = None
+        self._thread.quit()
     
     def start(self, interval_ms: int = UPDATE_INTERVAL_MS):
-        """Start monitoring resources."""
-        if not self.running:
-            self.timer.start(interval_ms)
-            self.running = True
+        """Start monitoring resources, or apply a new interval if already running."""
+        self._interval_ms = interval_ms
+        if not self._thread.isRunning():
+            self._thread.start()
+        self._timer_start_requested.emit(interval_ms)
+        self.running = True
     
-    def stop(self):
-        """Stop monitoring resources."""
+    def pause(self):
+        """Pause monitoring without waiting for an in-flight sample."""
         if self.running:
-            self.timer.stop()
+            self._timer_stop_requested.emit()
             self.running = False
     
+    def stop(self):
+        """Stop monitoring and join the worker thread (for application shutdown)."""
+        if self._thread.isRunning():
+            self._shutdown_requested.emit()
+            self._thread.wait()
+        self.running = False
+    
     def update_data(self):
         """Update resource usage data and emit signal."""
         self.data.update()
@@ -238,10 +469,60 @@ class ResourceMonitor(QObject):
         return self.data.get_latest()
     
     def get_history(self) -> Dict[str, Any]:
-        """Get the full history of resource usage data."""
+        """Get a snapshot of the full history of resource usage data.
+        
+        Intended for external consumers (export, tests); the widget reads the
+        series straight from self.data instead of rebuilding this dict per tick.
+        """
         return self.data.get_history()
 
 
+def _map_points_py(data, width, height, margin, max_value, min_value, legend_height=0):
+    """Map a data series to (x, y) widget coordinates."""
+    step = (width - 2 * margin) / (len(data) - 1)
+    scale = (height - 2 * margin - legend_height) / (max_value - min_value)
+    base = height - margin - legend_height
+    return [(margin + step * i, base - (value - min_value) * scale) for i, value in enumerate(data)]
+
+
+if HAS_NUMBA:
+    @njit(fastmath=True, cache=True)
+    def _map_points_jit(data, width, height, margin, max_value, min_value, legend_height):
+        """Compiled variant of _map_points_py returning an (N, 2) float32 array."""
+        n = data.shape[0]
+        points = np.empty((n, 2), dtype=np.float32)
+        step = (width - 2.0 * margin) / (n - 1)
+        scale = (height - 2.0 * margin - legend_height) / (max_value - min_value)
+        base = height - margin - legend_height
+        for i in range(n):
+            points[i, 0] = margin + step * i
+            points[i, 1] = base - (data[i] - min_value) * scale
+        return points
+
+
+_point_mapping_warmed_up = False
+
+
+def _warm_up_point_mapping():
+    """Trigger JIT compilation once, at widget creation rather than on the first paint."""
+    global _point_mapping_warmed_up
+    if HAS_NUMBA and not _point_mapping_warmed_up:
+        _map_points_jit(np.zeros(2, dtype=np.float64), 2.0, 2.0, 0.0, 1.0, 0.0, 0.0)
+        _point_mapping_warmed_up = True
+
+
+def _series_polygon(data, width, height, margin, max_value, min_value, legend_height=0) -> QPolygonF:
+    """Build the polyline for a data series, using the compiled mapping when available."""
+    if HAS_NUMBA:
+        points = _map_points_jit(
+            np.asarray(data, dtype=np.float64), float(width), float(height), float(margin),
+            float(max_value), float(min_value), float(legend_height)
+        ).tolist()
+    else:
+        points = _map_points_py(data, width, height, margin, max_value, min_value, legend_height)
+    return QPolygonF([QPointF(x, y) for x, y in points])
+
+
 class LineGraphWidget(QWidget):
     """Widget for displaying line graphs of resource usage."""
     
@@ -252,67 +533,104 @@ class LineGraphWidget(QWidget):
         self.data = []
         self.max_value = 100
         self.min_value = 0
+        self._dirty = False
+        self._chrome: Optional[QPixmap] = None  # Cached background, title, grid and labels
+        self._full_repaint = True
+        self._color = QColor(color)
+        self._data_pen = QPen(self._color, 2)
+        self._title_font = QFont()
+        self._title_font.setBold(True)
+        _warm_up_point_mapping()
         self.setMinimumHeight(150)
         self.setMinimumWidth(300)
     
     def set_data(self, data: List[float], max_value: Optional[float] = None):
         """Set data for the graph."""
         self.data = data
-        if max_value is not None:
+        if max_value is not None and max_value != self.max_value:
             self.max_value = max_value
-        self.update()
+            self._chrome = None  # Axis labels depend on the maximum value
+            self._full_repaint = True
+        self._dirty = True
     
-    def paintEvent(self, event):
-        """Paint the graph."""
-        if not self.data:
-            return
+    def resizeEvent(self, event):
+        """Invalidate the cached chrome when the widget is resized."""
+        self._chrome = None
+        super().resizeEvent(event)
+    
+    def _live_rect(self) -> QRect:
+        """Return the area the data layer can touch: everything right of the axis labels."""
+        margin = 30  # Margin for labels
+        return QRect(margin - 2, 0, self.width() - margin + 2, self.height())
+    
+    def repaint_dirty(self):
+        """Schedule a repaint of only the area that changes between samples."""
+        if self._full_repaint:
+            self._full_repaint = False
+            self.update()
+        else:
+            self.update(self._live_rect())
+    
+    def _render_chrome(self) -> QPixmap:
+        """Render the static parts of the graph (background, title, grid, labels)."""
+        dpr = self.devicePixelRatioF()
+        chrome = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        chrome.setDevicePixelRatio(dpr)
         
-        painter = QPainter(self)
+        painter = QPainter(chrome)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Draw background
-        painter.fillRect(self.rect(), QColor(COLORS["background"]))
+        painter.fillRect(self.rect(), _BRUSH_BG)
         
         # Draw title
-        painter.setPen(QColor(COLORS["text"]))
-        font = QFont()
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setPen(_QC[C.TEXT])
+        painter.setFont(self._title_font)
         painter.drawText(10, 20, self.title)
         
         # Draw grid
-        painter.setPen(QPen(QColor(COLORS["grid"]), 1, Qt.PenStyle.DotLine))
         width = self.width()
         height = self.height()
         margin = 30  # Margin for labels
         
-        # Horizontal grid lines (25%, 50%, 75%, 100%)
-        for i in range(1, 5):
-            y = height - margin - (height - 2 * margin) * (i * 0.25)
-            painter.drawLine(margin, int(y), width - margin, int(y))
-            painter.setPen(QColor(COLORS["text"]))
-            painter.drawText(5, int(y) + 5, f"{int(self.max_value * i * 0.25)}")
-            painter.setPen(QPen(QColor(COLORS["grid"]), 1, Qt.PenStyle.DotLine))
+        # Horizontal grid lines (25%, 50%, 75%, 100%), batched into one call
+        ys = [int(height - margin - (height - 2 * margin) * (i * 0.25)) for i in range(1, 5)]
+        painter.setPen(_PEN_GRID)
+        painter.drawLines([QLineF(margin, y, width - margin, y) for y in ys])
+        painter.setPen(_QC[C.TEXT])
+        for i, y in enumerate(ys, start=1):
+            painter.drawText(5, y + 5, f"{int(self.max_value * i * 0.25)}")
+        
+        painter.end()
+        return chrome
+    
+    def paintEvent(self, event):
+        """Paint the graph."""
+        if not self.data or not self.isVisible():
+            return
+        
+        if self._chrome is None:
+            self._chrome = self._render_chrome()
+        
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(0, 0, self._chrome)
+        
+        width = self.width()
+        height = self.height()
+        margin = 30  # Margin for labels
         
         # Draw data line
         if len(self.data) > 1:
-            painter.setPen(QPen(QColor(self.color), 2))
-            
-            path_points = []
-            for i, value in enumerate(self.data):
-                x = margin + (width - 2 * margin) * i / (len(self.data) - 1)
-                y = height - margin - (height - 2 * margin) * (value - self.min_value) / (self.max_value - self.min_value)
-                path_points.append((x, y))
-            
-            for i in range(len(path_points) - 1):
-                painter.drawLine(
-                    int(path_points[i][0]), int(path_points[i][1]),
-                    int(path_points[i+1][0]), int(path_points[i+1][1])
-                )
+            painter.setPen(self._data_pen)
+            painter.drawPolyline(
+                _series_polygon(self.data, width, height, margin, self.max_value, self.min_value)
+            )
             
             # Draw latest value
             latest_value = self.data[-1]
-            painter.setPen(QColor(COLORS["text"]))
+            painter.setPen(_QC[C.TEXT])
+            painter.setFont(self._title_font)
             painter.drawText(width - 70, 20, f"{latest_value:.1f}")
         
         painter.end()
@@ -329,73 +647,125 @@ class MultiLineGraphWidget(QWidget):
         self.data_series = [[] for _ in labels]
         self.max_value = 100
         self.min_value = 0
+        self._dirty = False
+        self._chrome: Optional[QPixmap] = None  # Cached background, title, grid, labels and legend
+        self._full_repaint = True
+        self._legend_value_x: List[int] = []  # Where each legend's live value is drawn
+        self._colors = [QColor(color) for color in colors]
+        self._data_pens = [QPen(color, 2) for color in self._colors]
+        self._title_font = QFont()
+        self._title_font.setBold(True)
+        _warm_up_point_mapping()
         self.setMinimumHeight(200)
         self.setMinimumWidth(300)
     
     def set_data(self, data_series: List[List[float]], max_value: Optional[float] = None):
         """Set data for the graph."""
         self.data_series = data_series
-        if max_value is not None:
+        if max_value is not None and max_value != self.max_value:
             self.max_value = max_value
-        self.update()
+            self._chrome = None  # Axis labels depend on the maximum value
+            self._full_repaint = True
+        self._dirty = True
     
-    def paintEvent(self, event):
-        """Paint the graph."""
-        if not self.data_series or not all(self.data_series):
-            return
+    def resizeEvent(self, event):
+        """Invalidate the cached chrome when the widget is resized."""
+        self._chrome = None
+        super().resizeEvent(event)
+    
+    def _live_rect(self) -> QRect:
+        """Return the area the data layer can touch: everything right of the axis labels."""
+        margin = 30  # Margin for labels
+        return QRect(margin - 2, 0, self.width() - margin + 2, self.height())
+    
+    def repaint_dirty(self):
+        """Schedule a repaint of only the area that changes between samples."""
+        if self._full_repaint:
+            self._full_repaint = False
+            self.update()
+        else:
+            self.update(self._live_rect())
+    
+    def _render_chrome(self) -> QPixmap:
+        """Render the static parts of the graph (background, title, grid, labels, legend keys)."""
+        dpr = self.devicePixelRatioF()
+        chrome = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        chrome.setDevicePixelRatio(dpr)
         
-        painter = QPainter(self)
+        painter = QPainter(chrome)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Draw background
-        painter.fillRect(self.rect(), QColor(COLORS["background"]))
+        painter.fillRect(self.rect(), _BRUSH_BG)
         
         # Draw title
-        painter.setPen(QColor(COLORS["text"]))
-        font = QFont()
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setPen(_QC[C.TEXT])
+        painter.setFont(self._title_font)
         painter.drawText(10, 20, self.title)
         
         # Draw grid
-        painter.setPen(QPen(QColor(COLORS["grid"]), 1, Qt.PenStyle.DotLine))
         width = self.width()
         height = self.height()
         margin = 30  # Margin for labels
         legend_height = 20 * len(self.labels)  # Height for the legend
         
-        # Horizontal grid lines (25%, 50%, 75%, 100%)
-        for i in range(1, 5):
-            y = height - margin - legend_height - (height - 2 * margin - legend_height) * (i * 0.25)
-            painter.drawLine(margin, int(y), width - margin, int(y))
-            painter.setPen(QColor(COLORS["text"]))
-            painter.drawText(5, int(y) + 5, f"{int(self.max_value * i * 0.25)}")
-            painter.setPen(QPen(QColor(COLORS["grid"]), 1, Qt.PenStyle.DotLine))
+        # Horizontal grid lines (25%, 50%, 75%, 100%), batched into one call
+        ys = [
+            int(height - margin - legend_height - (height - 2 * margin - legend_height) * (i * 0.25))
+            for i in range(1, 5)
+        ]
+        painter.setPen(_PEN_GRID)
+        painter.drawLines([QLineF(margin, y, width - margin, y) for y in ys])
+        painter.setPen(_QC[C.TEXT])
+        for i, y in enumerate(ys, start=1):
+            painter.drawText(5, y + 5, f"{int(self.max_value * i * 0.25)}")
+        
+        # Draw legend keys; the live values are drawn after them in paintEvent
+        metrics = painter.fontMetrics()
+        self._legend_value_x = []
+        for i, label in enumerate(self.labels):
+            y = height - legend_height + i * 20
+            painter.setPen(self._colors[i])
+            painter.drawLine(margin, y, margin + 20, y)
+            painter.setPen(_QC[C.TEXT])
+            key = f"{label}: "
+            painter.drawText(margin + 30, y + 5, key)
+            self._legend_value_x.append(margin + 30 + metrics.horizontalAdvance(key))
+        
+        painter.end()
+        return chrome
+    
+    def paintEvent(self, event):
+        """Paint the graph."""
+        if not self.data_series or not all(self.data_series) or not self.isVisible():
+            return
+        
+        if self._chrome is None:
+            self._chrome = self._render_chrome()
+        
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(0, 0, self._chrome)
+        
+        width = self.width()
+        height = self.height()
+        margin = 30  # Margin for labels
+        legend_height = 20 * len(self.labels)  # Height for the legend
         
         # Draw data lines
         for series_idx, data in enumerate(self.data_series):
             if len(data) > 1:
-                painter.setPen(QPen(QColor(self.colors[series_idx]), 2))
-                
-                path_points = []
-                for i, value in enumerate(data):
-                    x = margin + (width - 2 * margin) * i / (len(data) - 1)
-                    y = height - margin - legend_height - (height - 2 * margin - legend_height) * (value - self.min_value) / (self.max_value - self.min_value)
-                    path_points.append((x, y))
-                
-                for i in range(len(path_points) - 1):
-                    painter.drawLine(
-                        int(path_points[i][0]), int(path_points[i][1]),
-                        int(path_points[i+1][0]), int(path_points[i+1][1])
-                    )
+                painter.setPen(self._data_pens[series_idx])
+                painter.drawPolyline(
+                    _series_polygon(data, width, height, margin, self.max_value, self.min_value, legend_height)
+                )
         
-        # Draw legend
-        for i, label in enumerate(self.labels):
+        # Draw legend values
+        painter.setPen(_QC[C.TEXT])
+        painter.setFont(self._title_font)
+        for i, value_x in enumerate(self._legend_value_x):
             y = height - legend_height + i * 20
-            painter.setPen(QColor(self.colors[i]))
-            painter.drawLine(margin, y, margin + 20, y)
-            painter.setPen(QColor(COLORS["text"]))
-            painter.drawText(margin + 30, y + 5, f"{label}: {self.data_series[i][-1]:.1f}")
+            painter.drawText(value_x, y + 5, f"{self.data_series[i][-1]:.1f}")
         
         painter.end()
 
@@ -409,6 +779,15 @@ class GaugeWidget(QWidget):
         self.color = color
         self.value = 0
         self.max_value = 100
+        self._dirty = False
+        self._chrome: Optional[QPixmap] = None  # Cached background, title and empty arc
+        self._color = QColor(color)
+        self._value_pen = QPen(self._color, 10, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+        self._title_font = QFont()
+        self._title_font.setBold(True)
+        self._value_font = QFont()
+        self._value_font.setBold(True)
+        self._value_font.setPointSize(12)
         self.setMinimumHeight(120)
         self.setMinimumWidth(120)
     
@@ -417,45 +796,72 @@ class GaugeWidget(QWidget):
         self.value = value
         if max_value is not None:
             self.max_value = max_value
-        self.update()
+        self._dirty = True
     
-    def paintEvent(self, event):
-        """Paint the gauge."""
-        painter = QPainter(self)
+    def resizeEvent(self, event):
+        """Invalidate the cached chrome when the widget is resized."""
+        self._chrome = None
+        super().resizeEvent(event)
+    
+    def _geometry(self) -> Tuple[float, float, float]:
+        """Return the gauge centre and radius for the current size."""
+        width = self.width()
+        height = self.height()
+        return width / 2, height / 2 + 10, min(width, height) / 2 - 20
+    
+    def repaint_dirty(self):
+        """Schedule a repaint of only the dial; the title never changes."""
+        center_x, center_y, radius = self._geometry()
+        extent = int(radius) + 6  # Half the arc pen width plus antialiasing
+        self.update(QRect(int(center_x) - extent, int(center_y) - extent, 2 * extent, 2 * extent))
+    
+    def _render_chrome(self) -> QPixmap:
+        """Render the static parts of the gauge (background, title, background arc)."""
+        dpr = self.devicePixelRatioF()
+        chrome = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        chrome.setDevicePixelRatio(dpr)
+        
+        painter = QPainter(chrome)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Draw background
-        painter.fillRect(self.rect(), QColor(COLORS["background"]))
+        painter.fillRect(self.rect(), _BRUSH_BG)
         
         # Draw title
-        painter.setPen(QColor(COLORS["text"]))
-        font = QFont()
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setPen(_QC[C.TEXT])
+        painter.setFont(self._title_font)
         painter.drawText(10, 20, self.title)
         
-        # Draw gauge
-        width = self.width()
-        height = self.height()
-        center_x = width / 2
-        center_y = height / 2 + 10
-        radius = min(width, height) / 2 - 20
-        
         # Draw background arc
-        painter.setPen(QPen(QColor(COLORS["grid"]), 10, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
+        center_x, center_y, radius = self._geometry()
+        painter.setPen(_PEN_GAUGE_TRACK)
         painter.drawArc(int(center_x - radius), int(center_y - radius), int(radius * 2), int(radius * 2), 225 * 16, 90 * 16)
         
+        painter.end()
+        return chrome
+    
+    def paintEvent(self, event):
+        """Paint the gauge."""
+        if not self.isVisible():
+            return
+        
+        if self._chrome is None:
+            self._chrome = self._render_chrome()
+        
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(0, 0, self._chrome)
+        
+        center_x, center_y, radius = self._geometry()
+        
         # Draw value arc
         percentage = min(1.0, self.value / self.max_value)
-        painter.setPen(QPen(QColor(self.color), 10, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
+        painter.setPen(self._value_pen)
         painter.drawArc(int(center_x - radius), int(center_y - radius), int(radius * 2), int(radius * 2), 225 * 16, int(-percentage * 90 * 16))
         
         # Draw value text
-        painter.setPen(QColor(COLORS["text"]))
-        font = QFont()
-        font.setBold(True)
-        font.setPointSize(12)
-        painter.setFont(font)
+        painter.setPen(_QC[C.TEXT])
+        painter.setFont(self._value_font)
         text = f"{self.value:.1f}"
         text_rect = painter.fontMetrics().boundingRect(text)
         painter.drawText(int(center_x - text_rect.width() / 2), int(center_y + 5), text)
@@ -466,12 +872,51 @@ class GaugeWidget(QWidget):
 class ResourceMonitorWidget(QWidget):
     """Widget for displaying resource usage."""
     
+    dependencies_installed = pyqtSignal(bool)
+    status_message = pyqtSignal(str)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.monitor = ResourceMonitor(self)
+        self.monitor = ResourceMonitor()
         self.monitor.data_updated.connect(self.update_ui)
+        self.dependencies_installed.connect(self.on_dependencies_installed)
+        # Lets worker threads update the status label on the GUI thread
+        self.status_message.connect(self.show_status)
+        self._paint_widgets = []
+        self._last_data = None
+        self._current_interval_ms = UPDATE_INTERVAL_MS
+        # Set by hideEvent; distinguishes resuming from the first show
+        self._paused = False
+        
+        # The loaded model and the CUDA memory pool holding its weights
+        self._model = None
+        self._tokenizer = None
+        self._model_pool = None
         self.init_ui()
-        self.monitor.start()
+        
+        # Repaint dirty widgets at a capped rate, independent of the sampling rate.
+        # Sampling and painting only run while the widget is shown (see showEvent).
+        self.paint_timer = QTimer(self)
+        self.paint_timer.timeout.connect(self.flush_paints)
+    
+    def showEvent(self, event):
+        """Resume sampling when the widget becomes visible."""
+        super().showEvent(event)
+        if not self.monitor.running:
+            if self._paused:
+                # No samples are taken while hidden, so the history has a gap
+                self.status_label.setText("Resuming...")
+                self._paused = False
+            self.monitor.start(self._current_interval_ms)
+            self.paint_timer.start(PAINT_INTERVAL_MS)
+    
+    def hideEvent(self, event):
+        """Pause sampling while the widget is not on screen."""
+        super().hideEvent(event)
+        self.paint_timer.stop()
+        if self.monitor.running:
+            self.monitor.pause()
+            self._paused = True
     
     def init_ui(self):
         """Initialize the UI."""
@@ -510,6 +955,7 @@ class ResourceMonitorWidget(QWidget):
         ram_gauge = GaugeWidget("RAM", COLORS["ram"])
         self.cpu_gauge = cpu_gauge
         self.ram_gauge = ram_gauge
+        self._paint_widgets.extend([cpu_gauge, ram_gauge])
         
         system_layout.addWidget(cpu_gauge)
         system_layout.addWidget(ram_gauge)
@@ -524,9 +970,10 @@ class ResourceMonitorWidget(QWidget):
         graphs_group = QGroupBox("Resource Usage History")
         graphs_layout = QVBoxLayout(graphs_group)
         
-        # CPU and RAM graphs
-        self.cpu_graph = LineGraphWidget("CPU Usage (%)", COLORS["cpu"])
-        self.ram_graph = LineGraphWidget("RAM Usage (GB)", COLORS["ram"])
+        # CPU and RAM graphs (system-wide and this process)
+        self.cpu_graph = MultiLineGraphWidget("CPU Usage (%)", ["System", "App"], [COLORS["cpu"], COLORS["process"]])
+        self.ram_graph = MultiLineGraphWidget("RAM Usage (GB)", ["System", "App"], [COLORS["ram"], COLORS["process"]])
+        self._paint_widgets.extend([self.cpu_graph, self.ram_graph])
         
         graphs_layout.addWidget(self.cpu_graph)
         graphs_layout.addWidget(self.ram_graph)
@@ -553,7 +1000,10 @@ class ResourceMonitorWidget(QWidget):
         model_layout.addLayout(model_info_layout)
         
         # Model memory graph
-        self.model_memory_graph = LineGraphWidget("Model Memory Usage (GB)", COLORS["vram"])
+        self.model_memory_graph = MultiLineGraphWidget(
+            "Model Memory Usage (GB)", ["Allocated", "Reserved"], [COLORS["vram"], COLORS["gpu"]]
+        )
+        self._paint_widgets.append(self.model_memory_graph)
         model_layout.addWidget(self.model_memory_graph)
         
         overview_layout.addWidget(model_group)
@@ -561,9 +1011,24 @@ class ResourceMonitorWidget(QWidget):
         # Add overview tab
         self.tabs.addTab(overview_tab, "Overview")
         
+        # Long view tab (reservoir-sampled history since the model was loaded)
+        long_view_tab = QWidget()
+        long_view_layout = QVBoxLayout(long_view_tab)
+        self.model_memory_long_graph = LineGraphWidget("Model Memory, Long View (GB)", COLORS["vram"])
+        self._paint_widgets.append(self.model_memory_long_graph)
+        long_view_layout.addWidget(self.model_memory_long_graph)
+        self.tabs.addTab(long_view_tab, "Long View")
+        
         # GPU Details tab (will be added if GPUs are detected)
         self.gpu_tab = QWidget()
         self.gpu_tab_layout = QVBoxLayout(self.gpu_tab)
+        self.gpu_detail_labels = []
+        self.gpu_detail_usage_graphs = []
+        self.gpu_detail_mem_graphs = []
+        self._built_gpu_count = 0
+        
+        # Refresh the newly exposed tab, whose widgets may have skipped updates
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         
         # Add tabs to main layout
         main_layout.addWidget(self.tabs)
@@ -631,14 +1096,19 @@ class ResourceMonitorWidget(QWidget):
     
     def update_ui(self, data: Dict[str, Any]):
         """Update the UI with new resource data."""
+        self._last_data = data
+        if self.status_label.text() == "Resuming...":
+            self.status_label.setText("Monitoring resources...")
+        
         # Update CPU and RAM gauges
         self.cpu_gauge.set_value(data["cpu_usage"])
         self.ram_gauge.set_value(data["ram_usage"], data["ram_total"])
         
-        # Update CPU and RAM graphs
-        history = self.monitor.get_history()
-        self.cpu_graph.set_data(history["cpu_usage"])
-        self.ram_graph.set_data(history["ram_usage"], history["ram_total"])
+        # Update CPU and RAM graphs. History series are immutable tuples that the
+        # sampler thread swaps atomically, so they can be read here by reference.
+        hist = self.monitor.data
+        self.cpu_graph.set_data([hist.cpu_usage, hist.proc_cpu_usage])
+        self.ram_graph.set_data([hist.ram_usage, hist.proc_ram_usage], hist.ram_total)
         
         # Update model info
         if data["model_loaded"]:
@@ -647,79 +1117,110 @@ class ResourceMonitorWidget(QWidget):
             self.model_precision_label.setText(f"Precision: {data['model_precision']}")
             
             # Update model memory graph
-            self.model_memory_graph.set_data(history["model_memory"])
+            self.model_memory_graph.set_data(
+                [hist.model_memory, hist.model_reserved],
+                data["model_device_total"] or None
+            )
+            self.model_memory_long_graph.set_data(hist.model_memory_long, data["model_device_total"] or None)
         
         # Update GPU information if available
-        if data["gpu_count"] > 0:
-            # Add GPU tab if not already added
-            if self.tabs.count() == 1:
-                self.tabs.addTab(self.gpu_tab, "GPU Details")
-            
-            # Add GPU gauges if not already added
-            while len(self.gpu_gauges) < data["gpu_count"]:
-                idx = len(self.gpu_gauges)
-                gpu_gauge = GaugeWidget(f"GPU {idx}", COLORS["gpu"])
-                self.gpu_gauges.append(gpu_gauge)
-                self.gpu_layout.addWidget(gpu_gauge)
-            
-            # Update GPU gauges
-            for i, gauge in enumerate(self.gpu_gauges):
-                if i < data["gpu_count"]:
-                    gauge.set_value(data["gpu_usage"][i], 100)
-            
-            # Add GPU graphs if not already added
-            while len(self.gpu_usage_graphs) < data["gpu_count"]:
-                idx = len(self.gpu_usage_graphs)
-                gpu_usage_graph = LineGraphWidget(f"GPU {idx} Usage (%)", COLORS["gpu"])
-                self.gpu_usage_graphs.append(gpu_usage_graph)
-                self.gpu_graphs_layout.addWidget(gpu_usage_graph)
-                
-                gpu_memory_graph = LineGraphWidget(f"GPU {idx} Memory (GB)", COLORS["vram"])
-                self.gpu_memory_graphs.append(gpu_memory_graph)
-                self.gpu_graphs_layout.addWidget(gpu_memory_graph)
-            
-            # Update GPU graphs
-            for i, graph in enumerate(self.gpu_usage_graphs):
-                if i < data["gpu_count"]:
-                    graph.set_data(history["gpu_usage"][i])
-            
-            for i, graph in enumerate(self.gpu_memory_graphs):
-                if i < data["gpu_count"]:
-                    graph.set_data(history["gpu_memory"][i], history["gpu_total_memory"][i])
-            
-            # Update GPU tab
-            if not self.gpu_tab_layout.count():
-                for i in range(data["gpu_count"]):
-                    gpu_group = QGroupBox(f"GPU {i}: {data['gpu_names'][i]}")
-                    gpu_layout = QVBoxLayout(gpu_group)
-                    
-                    # GPU details
-                    details_layout = QHBoxLayout()
-                    usage_label = QLabel(f"Usage: {data['gpu_usage'][i]:.1f}%")
-                    memory_label = QLabel(f"Memory: {data['gpu_memory'][i]:.1f} GB / {data['gpu_total_memory'][i]:.1f} GB")
-                    temp_label = QLabel(f"Temperature: {data['gpu_temperatures'][i]:.1f}°C")
-                    details_layout.addWidget(usage_label)
-                    details_layout.addWidget(memory_label)
-                    details_layout.addWidget(temp_label)
-                    
-                    gpu_layout.addLayout(details_layout)
-                    
-                    # GPU graphs
-                    gpu_usage_graph = LineGraphWidget(f"GPU {i} Usage (%)", COLORS["gpu"])
-                    gpu_usage_graph.set_data(history["gpu_usage"][i])
-                    gpu_layout.addWidget(gpu_usage_graph)
-                    
-                    gpu_memory_graph = LineGraphWidget(f"GPU {i} Memory (GB)", COLORS["vram"])
-                    gpu_memory_graph.set_data(history["gpu_memory"][i], history["gpu_total_memory"][i])
-                    gpu_layout.addWidget(gpu_memory_graph)
-                    
-                    self.gpu_tab_layout.addWidget(gpu_group)
+        gpu_count = data["gpu_count"]
+        if gpu_count > 0:
+            if self._built_gpu_count != gpu_count:
+                self._ensure_gpu_widgets(gpu_count, data["gpu_names"])
+            
+            # Update GPU gauges and overview graphs
+            for i in range(gpu_count):
+                self.gpu_gauges[i].set_value(data["gpu_usage"][i], 100)
+                self.gpu_usage_graphs[i].set_data(hist.gpu_usage[i])
+                self.gpu_memory_graphs[i].set_data(hist.gpu_memory[i], data["gpu_total_memory"][i])
+            
+            # Update GPU tab (only while it is the current tab)
+            if self.tabs.currentWidget() is self.gpu_tab:
+                for i in range(gpu_count):
+                    usage_label, memory_label, temp_label = self.gpu_detail_labels[i]
+                    usage_label.setText(f"Usage: {data['gpu_usage'][i]:.1f}%")
+                    memory_label.setText(f"Memory: {data['gpu_memory'][i]:.1f} GB / {data['gpu_total_memory'][i]:.1f} GB")
+                    temp_label.setText(f"Temperature: {data['gpu_temperatures'][i]:.1f}°C")
+                    self.gpu_detail_usage_graphs[i].set_data(hist.gpu_usage[i])
+                    self.gpu_detail_mem_graphs[i].set_data(hist.gpu_memory[i], data["gpu_total_memory"][i])
+    
+    def _ensure_gpu_widgets(self, gpu_count: int, gpu_names: List[str]):
+        """Create the per-GPU gauges, graphs and detail panels that don't exist yet."""
+        # Add GPU tab if not already added
+        if self.tabs.indexOf(self.gpu_tab) == -1:
+            self.tabs.addTab(self.gpu_tab, "GPU Details")
+        
+        for i in range(self._built_gpu_count, gpu_count):
+            # Overview gauge and graphs
+            gpu_gauge = GaugeWidget(f"GPU {i}", COLORS["gpu"])
+            self.gpu_gauges.append(gpu_gauge)
+            self.gpu_layout.addWidget(gpu_gauge)
+            
+            gpu_usage_graph = LineGraphWidget(f"GPU {i} Usage (%)", COLORS["gpu"])
+            self.gpu_usage_graphs.append(gpu_usage_graph)
+            self.gpu_graphs_layout.addWidget(gpu_usage_graph)
+            
+            gpu_memory_graph = LineGraphWidget(f"GPU {i} Memory (GB)", COLORS["vram"])
+            self.gpu_memory_graphs.append(gpu_memory_graph)
+            self.gpu_graphs_layout.addWidget(gpu_memory_graph)
+            
+            # GPU Details tab panel
+            gpu_group = QGroupBox(f"GPU {i}: {gpu_names[i]}")
+            gpu_layout = QVBoxLayout(gpu_group)
+            
+            details_layout = QHBoxLayout()
+            usage_label = QLabel("Usage: N/A")
+            memory_label = QLabel("Memory: N/A")
+            temp_label = QLabel("Temperature: N/A")
+            details_layout.addWidget(usage_label)
+            details_layout.addWidget(memory_label)
+            details_layout.addWidget(temp_label)
+            gpu_layout.addLayout(details_layout)
+            self.gpu_detail_labels.append((usage_label, memory_label, temp_label))
+            
+            detail_usage_graph = LineGraphWidget(f"GPU {i} Usage (%)", COLORS["gpu"])
+            self.gpu_detail_usage_graphs.append(detail_usage_graph)
+            gpu_layout.addWidget(detail_usage_graph)
+            
+            detail_mem_graph = LineGraphWidget(f"GPU {i} Memory (GB)", COLORS["vram"])
+            self.gpu_detail_mem_graphs.append(detail_mem_graph)
+            gpu_layout.addWidget(detail_mem_graph)
+            
+            self.gpu_tab_layout.addWidget(gpu_group)
+            
+            self._paint_widgets.extend([
+                gpu_gauge, gpu_usage_graph, gpu_memory_graph, detail_usage_graph, detail_mem_graph
+            ])
+        
+        self._built_gpu_count = gpu_count
+    
+    def flush_paints(self):
+        """Schedule a repaint for every widget whose data changed since the last flush."""
+        for widget in self._paint_widgets:
+            # Hidden widgets stay dirty and are repainted once they are shown
+            if widget._dirty and widget.isVisible():
+                widget._dirty = False
+                widget.repaint_dirty()
+    
+    def on_tab_changed(self, index):
+        """Bring the newly selected tab up to date with the latest data."""
+        if self._last_data is not None:
+            self.update_ui(self._last_data)
+    
+    def on_dependencies_installed(self, success: bool):
+        """Report the result of the background dependency install."""
+        if success:
+            self.status_label.setText("Resource monitor dependencies installed. Restart to use them.")
+        else:
+            self.status_label.setText("Error installing resource monitor dependencies.")
     
     def change_refresh_rate(self, index):
         """Change the refresh rate of the monitor."""
         rates = [1000, 2000, 5000]  # milliseconds
-        self.monitor.stop()
-        self.monitor.start(rates[index])
+        self._current_interval_ms = rates[index]
+        if self.monitor.running:
+            self.monitor.start(self._current_interval_ms)
         self.status_label.setText(f"Refresh rate set to {self.refresh_rate_combo.currentText()}")
     
     def load_model(self):
@@ -729,7 +1230,7 @@ class ResourceMonitorWidget(QWidget):
             precision = self.precision_combo.currentText()
             device = self.device_combo.currentText()
             
-            # Import the model loading function
+            # Import the model loading function (kept lazy: it pulls in transformers)
             from r1_1776_utils import load_model
             
             # Create configuration based on selected options
@@ -748,108 +1249,200 @@ class ResourceMonitorWidget(QWidget):
             self.status_label.setText("Loading model... This may take a while.")
             
             # Load the model in a separate thread to avoid freezing the UI
-            threading.Thread(target=self._load_model_thread, args=(force_config,), daemon=True).start()
+            threading.Thread(target=self._load_model_thread, args=(load_model, force_config), daemon=True).start()
             
         except ImportError:
             self.status_label.setText("Error: r1_1776_utils module not found.")
         except Exception as e:
             self.status_label.setText(f"Error loading model: {e}")
     
-    def _load_model_thread(self, force_config):
+    def _load_model_thread(self, load_model, force_config):
         """Thread function to load the model."""
         try:
-            from r1_1776_utils import load_model
+            # Load the model into its own memory pool so that unloading returns
+            # all of its segments instead of leaving them in the shared cache
+            pool = None
+            if HAS_MEMPOOL and force_config.get("device_map") != "cpu" and torch.cuda.is_available():
+                pool = torch.cuda.MemPool()
             
-            # Load the model
-            tokenizer, model = load_model(force_config=force_config)
+            if pool is not None:
+                with torch.cuda.use_mem_pool(pool):
+                    tokenizer, model = load_model(force_config=force_config)
+            else:
+                tokenizer, model = load_model(force_config=force_config)
+            
+            # Keep a reference so the model stays loaded until unload_model
+            self._tokenizer, self._model, self._model_pool = tokenizer, model, pool
             
             # Update model info
-            device = "CPU" if force_config.get("device_map") == "cpu" else "GPU"
+            device = "CPU" if force_config.get("device_map") == "cpu" else str(getattr(model, "device", "cuda:0"))
             precision = "4-bit" if force_config.get("load_in_4bit") else "8-bit" if force_config.get("load_in_8bit") else "FP16"
             
             # Update monitor with model info
             self.monitor.set_model_info(True, device, precision, "R1-1776")
             
             # Update status
-            self.status_label.setText(f"Model loaded successfully using {device} with {precision} precision.")
+            self.status_message.emit(f"Model loaded successfully using {device} with {precision} precision.")
             
         except Exception as e:
-            self.status_label.setText(f"Error loading model: {e}")
+            self.status_message.emit(f"Error loading model: {e}")
+    
+    def show_status(self, text: str):
+        """Show a status message (slot for status_message)."""
+        self.status_label.setText(text)
+    
+    def _cuda_device_index(self) -> int:
+        """Return the CUDA device the model lives on, or the current device."""
+        index = self.monitor.data._model_dev_idx
+        return index if index is not None else torch.cuda.current_device()
     
     def unload_model(self):
         """Unload the R1-1776 model."""
         try:
-            # Import torch for garbage collection
-            import torch
+            # Read the model's device and reserved memory before set_model_info clears them
+            device_index = None
+            reserved = 0
+            if HAS_TORCH and torch.cuda.is_available():
+                device_index = self._cuda_device_index()
+                reserved = torch.cuda.memory_reserved(device_index)
             
-            # Clear CUDA cache
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            
-            # Run garbage collection
-            import gc
-            gc.collect()
+            # Drop the references that keep the model alive
+            self._model = None
+            self._tokenizer = None
             
             # Update model info
             self.monitor.set_model_info(False, "N/A", "N/A", "N/A")
             
+            # Collect garbage and release the CUDA cache off the UI thread
+            threading.Thread(target=self._unload_model_thread, args=(device_index, reserved),
+                             daemon=True).start()
+            
             # Update status
-            self.status_label.setText("Model unloaded successfully.")
+            self.status_label.setText("Unloading model...")
             
         except Exception as e:
             self.status_label.setText(f"Error unloading model: {e}")
     
+    def _unload_model_thread(self, device_index, reserved):
+        """Thread function to free the model's memory."""
+        try:
+            # Run garbage collection
+            gc.collect()
+            
+            # With the model's tensors freed, dropping the pool releases its segments
+            pool, self._model_pool = self._model_pool, None
+            del pool
+            
+            # empty_cache walks every cached block and synchronizes the device, so
+            # only pay for it when the allocator is holding most of the device memory
+            if device_index is not None:
+                torch.cuda.set_device(device_index)
+                total = torch.cuda.get_device_properties(device_index).total_memory
+                if reserved > CACHE_RELEASE_FRACTION * total:
+                    torch.cuda.empty_cache()
+            
+            self.status_message.emit("Model unloaded successfully.")
+            
+        except Exception as e:
+            self.status_message.emit(f"Error unloading model: {e}")
+    
     def clear_cache(self):
         """Clear CUDA cache."""
         try:
             if HAS_TORCH and torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                self.status_label.setText("CUDA cache cleared.")
+                self.status_label.setText("Clearing CUDA cache...")
+                threading.Thread(target=self._clear_cache_thread, args=(self._cuda_device_index(),),
+                                 daemon=True).start()
             else:
                 self.status_label.setText("No CUDA device available.")
         except Exception as e:
             self.status_label.setText(f"Error clearing cache: {e}")
     
+    def _clear_cache_thread(self, device_index: int):
+        """Thread function to clear the CUDA cache."""
+        try:
+            # Select the device first so the cache is released on it, not on GPU 0
+            torch.cuda.set_device(device_index)
+            torch.cuda.empty_cache()
+            self.status_message.emit("CUDA cache cleared.")
+        except Exception as e:
+            self.status_message.emit(f"Error clearing cache: {e}")
+    
     def run_garbage_collection(self):
         """Run Python garbage collection."""
         try:
-            import gc
             gc.collect()
             self.status_label.setText("Garbage collection completed.")
         except Exception as e:
             self.status_label.setText(f"Error running garbage collection: {e}")
 
 
+# Packages the resource monitor needs, checked once at import
+REQUIRED_PACKAGES = {
+    "psutil": ">=5.9.0",
+    "GPUtil": ">=1.4.0"
+}
+
+
+def _find_missing_packages() -> List[str]:
+    """Return requirement strings for required packages that are not installed."""
+    missing_packages = []
+    for package, version in REQUIRED_PACKAGES.items():
+        try:
+            distribution(package)
+        except PackageNotFoundError:
+            missing_packages.append(f"{package}{version}")
+    return missing_packages
+
+
+_MISSING_PACKAGES = _find_missing_packages()
+_DEPS_OK = not _MISSING_PACKAGES
+_install_attempted = False
+
+
+def _install_deps(packages: List[str], done_signal):
+    """Install packages with pip and emit done_signal with the outcome (runs on a background thread)."""
+    try:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "pip", "install"] + packages,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        returncode = process.wait()
+        success = returncode == 0
+        if not success:
+            logger.error(f"Installing dependencies failed: pip exited with code {returncode}")
+    except Exception as e:
+        logger.error(f"Error installing dependencies: {e}")
+        success = False
+    
+    try:
+        done_signal.emit(success)
+    except RuntimeError:
+        # The widget was closed before the install finished
+        pass
+
+
 # Function to create a resource monitor tab for the browser
 def create_resource_monitor_tab(browser):
     """Create a resource monitor tab for the browser."""
+    global _install_attempted
+    
     if not HAS_PYQT:
         return None
     
     # Create the resource monitor widget
     monitor_widget = ResourceMonitorWidget()
     
-    # Add required dependencies to requirements.txt if not already present
-    try:
-        import pkg_resources
-        
-        required_packages = {
-            "psutil": ">=5.9.0",
-            "GPUtil": ">=1.4.0"
-        }
-        
-        missing_packages = []
-        for package, version in required_packages.items():
-            try:
-                pkg_resources.get_distribution(package)
-            except pkg_resources.DistributionNotFound:
-                missing_packages.append(f"{package}{version}")
-        
-        if missing_packages:
-            print(f"Installing required packages for resource monitor: {', '.join(missing_packages)}")
-            import subprocess
-            subprocess.check_call([sys.executable, "-m", "pip", "install"] + missing_packages)
-    except Exception as e:
-        print(f"Error checking dependencies: {e}")
+    # Install missing dependencies off the UI thread, at most once per process
+    if not _DEPS_OK and not _install_attempted:
+        _install_attempted = True
+        logger.info(f"Installing required packages for resource monitor: {', '.join(_MISSING_PACKAGES)}")
+        monitor_widget.status_label.setText("Installing resource monitor dependencies...")
+        threading.Thread(
+            target=_install_deps,
+            args=(_MISSING_PACKAGES, monitor_widget.dependencies_installed),
+            daemon=True
+        ).start()
     
     return monitor_widget
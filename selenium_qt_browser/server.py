@@ -8,12 +8,36 @@ allowing them to control the browser and terminal through HTTP requests.
 import os
 import sys
 import json
+import time
 import threading
 import logging
-from typing import Dict, Any, Optional
+from http import HTTPStatus
+from typing import Dict, Any, Optional, Callable, List, Tuple
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
+from werkzeug.serving import run_simple
+
+# Optional fast JSON encoder
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Pluggable JSON providers need Flask >= 2.2
+try:
+    from flask.json.provider import JSONProvider
+    HAS_JSON_PROVIDER = True
+except ImportError:
+    HAS_JSON_PROVIDER = False
+
+# Optional production WSGI server
+try:
+    import waitress
+    HAS_WAITRESS = True
+except ImportError:
+    HAS_WAITRESS = False
 
 from selenium_qt_browser.api import BrowserController
 
@@ -25,180 +49,321 @@ logging.basicConfig(
 )
 logger = logging.getLogger('selenium_qt_browser.server')
 
+STATUS_CACHE_TTL = 0.1  # Seconds a /api/status response body is reused
+TABS_INFO_MAX_AGE = 1.0  # Seconds a tabs snapshot is reused; in-page navigation emits no tabs_changed
+
+
+if HAS_ORJSON and HAS_JSON_PROVIDER:
+    class OrjsonProvider(JSONProvider):
+        """Flask JSON provider that encodes and decodes with orjson."""
+        
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return orjson.dumps(obj).decode('utf-8')
+        
+        def loads(self, s, **kwargs: Any) -> Any:
+            return orjson.loads(s)
+
 
 class APIServer:
     """HTTP server for the browser API."""
     
-    def __init__(self, browser_controller: BrowserController, host: str = '127.0.0.1', port: int = 5000):
+    def __init__(self, browser_controller: BrowserController, host: str = '127.0.0.1', port: int = 5000,
+                 threads: int = 8, fast_dispatch: bool = True):
         self.browser_controller = browser_controller
         self.host = host
         self.port = port
+        self.threads = threads
         self.app = Flask(__name__)
+        if HAS_ORJSON and HAS_JSON_PROVIDER:
+            self.app.json = OrjsonProvider(self.app)
         CORS(self.app)  # Enable CORS for all routes
         
+        # Flat (method, path) dispatch table served by __call__; routes with an
+        # <int:...> parameter are matched by prefix. With fast_dispatch off,
+        # every request goes through Flask's router instead.
+        self.fast_dispatch = fast_dispatch
+        self._routes: Dict[Tuple[str, str], Callable] = {}
+        self._param_routes: List[Tuple[str, str, str, Callable]] = []
+        
         # Register routes
         self.register_routes()
         
         self.server_thread = None
+        self._wsgi_server = None
+        self._status_cache = None  # (monotonic time, encoded body) of the last /api/status response
+        self._tabs_info_cache = None  # (monotonic time, get_tabs_info() result)
+        
+        # Drop the cached snapshots whenever the UI reports a tab change. The slot is
+        # queued to the GUI thread, so the tab handlers below also invalidate directly
+        # before answering; otherwise the next request could see the old snapshot.
+        self.browser_controller.tabs_changed.connect(self.invalidate_tabs_cache)
         self.is_running = False
     
+    @staticmethod
+    def _encode(obj) -> bytes:
+        """Encode obj as JSON, using orjson when it is available."""
+        if HAS_ORJSON:
+            return orjson.dumps(obj)
+        return json.dumps(obj).encode('utf-8')
+    
+    def _encode_result(self, result) -> Tuple[bytes, int]:
+        """Turn a handler result (obj or (obj, status); obj may be pre-encoded bytes) into body and status."""
+        status = 200
+        if isinstance(result, tuple):
+            result, status = result
+        body = result if isinstance(result, bytes) else self._encode(result)
+        return body, status
+    
+    def invalidate_tabs_cache(self):
+        """Drop the cached tabs snapshot and /api/status response after the tabs changed."""
+        self._tabs_info_cache = None
+        self._status_cache = None
+    
+    def _tabs_info(self) -> Dict[str, Any]:
+        """Return the tabs snapshot, asking the controller only when the cache is stale."""
+        now = time.monotonic()
+        cached = self._tabs_info_cache
+        if cached is not None and now - cached[0] < TABS_INFO_MAX_AGE:
+            return cached[1]
+        
+        tabs_info = self.browser_controller.get_tabs_info()
+        self._tabs_info_cache = (now, tabs_info)
+        return tabs_info
+    
+    def route(self, method: str, rule: str):
+        """Register a handler for both the flat dispatch table and the Flask app.
+        
+        Handlers take the parsed JSON body (None for GET requests) plus any URL
+        parameters, and return an object or an (object, status) tuple.
+        """
+        def decorator(handler: Callable):
+            if '<int:' in rule:
+                prefix, param = rule.split('<int:', 1)
+                self._param_routes.append((method, prefix, param.rstrip('>'), handler))
+            else:
+                self._routes[(method, rule)] = handler
+            
+            def view(**kwargs):
+                # Parse the body once; a missing or malformed body reaches the handler as None
+                data = request.get_json(silent=True) if method == 'POST' else None
+                body, status = self._encode_result(handler(data, **kwargs))
+                return Response(body, status=status, mimetype='application/json')
+            
+            self.app.add_url_rule(rule, endpoint=handler.__name__, view_func=view, methods=[method])
+            return handler
+        return decorator
+    
+    def __call__(self, environ, start_response):
+        """WSGI entry point: serve known routes from the flat table, anything else through Flask."""
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO', '')
+        
+        kwargs = {}
+        handler = self._routes.get((method, path))
+        if handler is None:
+            for route_method, prefix, param, param_handler in self._param_routes:
+                if route_method == method and path.startswith(prefix) and path[len(prefix):].isdigit():
+                    handler = param_handler
+                    kwargs[param] = int(path[len(prefix):])
+                    break
+            else:
+                # CORS preflights, 404s and anything unusual keep Flask's behaviour
+                return self.app(environ, start_response)
+        
+        data = None
+        if method == 'POST':
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+            raw = environ['wsgi.input'].read(length) if length else b''
+            if raw:
+                try:
+                    data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+                except ValueError:
+                    data = None
+        
+        try:
+            body, status = self._encode_result(handler(data, **kwargs))
+        except Exception as e:
+            logger.warning("Error handling %s %s: %s", method, path, e)
+            body, status = self._encode({"error": str(e)}), 500
+        
+        start_response(f"{status} {HTTPStatus(status).phrase}", [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(body))),
+            ('Access-Control-Allow-Origin', '*'),  # Same as flask_cors for the Flask routes
+        ])
+        return [body]
+    
     def register_routes(self):
         """Register the API routes."""
         
-        @self.app.route('/api/status', methods=['GET'])
-        def status():
+        @self.route('GET', '/api/status')
+        def status(data):
             """Get the server status."""
-            return jsonify({
+            now = time.monotonic()
+            cached = self._status_cache
+            if cached is not None and now - cached[0] < STATUS_CACHE_TTL:
+                return cached[1]
+            
+            body = self._encode({
                 "status": "running",
-                "tabs": self.browser_controller.get_tabs_info()
+                "tabs": self._tabs_info()
             })
+            self._status_cache = (now, body)
+            return body
         
-        @self.app.route('/api/command', methods=['POST'])
-        def execute_command():
+        @self.route('POST', '/api/command')
+        def execute_command(data):
             """Execute a command."""
             try:
-                data = request.json
                 if not data:
-                    return jsonify({"error": "No JSON data provided"}), 400
+                    return {"error": "No JSON data provided"}, 400
                 
                 command_type = data.get('type')
                 command = data.get('command')
                 args = data.get('args', {})
                 
                 if not command_type or not command:
-                    return jsonify({"error": "Missing 'type' or 'command' field"}), 400
+                    return {"error": "Missing 'type' or 'command' field"}, 400
                 
-                result = self.browser_controller.execute_command(command_type, command, **args)
-                return jsonify(result)
+                return self.browser_controller.execute_command(command_type, command, **args)
             
             except Exception as e:
-                logger.exception("Error executing command")
-                return jsonify({"error": str(e)}), 500
+                # Bad client input is common; only pay for a traceback when debugging
+                logger.warning("Error executing command: %s", e)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Command traceback", exc_info=True)
+                return {"error": str(e)}, 500
         
-        @self.app.route('/api/tabs', methods=['GET'])
-        def get_tabs():
+        @self.route('GET', '/api/tabs')
+        def get_tabs(data):
             """Get information about all tabs."""
-            return jsonify(self.browser_controller.get_tabs_info())
+            return self._tabs_info()
         
-        @self.app.route('/api/tabs/switch/<int:tab_index>', methods=['POST'])
-        def switch_tab(tab_index):
+        @self.route('POST', '/api/tabs/switch/<int:tab_index>')
+        def switch_tab(data, tab_index):
             """Switch to a specific tab."""
-            return jsonify(self.browser_controller.switch_to_tab(tab_index))
+            result = self.browser_controller.switch_to_tab(tab_index)
+            self.invalidate_tabs_cache()
+            return result
         
-        @self.app.route('/api/tabs/create', methods=['POST'])
-        def create_tab():
+        @self.route('POST', '/api/tabs/create')
+        def create_tab(data):
             """Create a new tab."""
-            data = request.json or {}
+            data = data or {}
             tab_type = data.get('tab_type', 'browser')
-            return jsonify(self.browser_controller.create_tab(tab_type))
+            result = self.browser_controller.create_tab(tab_type)
+            self.invalidate_tabs_cache()
+            return result
         
-        @self.app.route('/api/tabs/close/<int:tab_index>', methods=['POST'])
-        def close_tab(tab_index):
+        @self.route('POST', '/api/tabs/close/<int:tab_index>')
+        def close_tab(data, tab_index):
             """Close a specific tab."""
-            return jsonify(self.browser_controller.close_tab(tab_index))
+            result = self.browser_controller.close_tab(tab_index)
+            self.invalidate_tabs_cache()
+            return result
         
-        @self.app.route('/api/browser/info', methods=['GET'])
-        def get_page_info():
+        @self.route('GET', '/api/browser/info')
+        def get_page_info(data):
             """Get information about the current webpage."""
-            return jsonify(self.browser_controller.execute_browser_command('get_page_info'))
+            return self.browser_controller.execute_browser_command('get_page_info')
         
-        @self.app.route('/api/browser/navigate', methods=['POST'])
-        def navigate():
+        @self.route('POST', '/api/browser/navigate')
+        def navigate(data):
             """Navigate to a URL."""
-            data = request.json or {}
+            data = data or {}
             url = data.get('url')
             if not url:
-                return jsonify({"error": "Missing 'url' field"}), 400
-            return jsonify(self.browser_controller.execute_browser_command('navigate', url=url))
+                return {"error": "Missing 'url' field"}, 400
+            return self.browser_controller.execute_browser_command('navigate', url=url)
         
-        @self.app.route('/api/browser/click', methods=['POST'])
-        def click_element():
+        @self.route('POST', '/api/browser/click')
+        def click_element(data):
             """Click an element on the webpage."""
-            data = request.json or {}
+            data = data or {}
             element_id = data.get('element_id')
             selector = data.get('selector')
             position = data.get('position')
             
             if not any([element_id, selector, position]):
-                return jsonify({"error": "Must provide element_id, selector, or position"}), 400
+                return {"error": "Must provide element_id, selector, or position"}, 400
             
-            return jsonify(self.browser_controller.execute_browser_command(
+            return self.browser_controller.execute_browser_command(
                 'click_element', 
                 element_id=element_id, 
                 selector=selector, 
                 position=position
-            ))
+            )
         
-        @self.app.route('/api/browser/fill', methods=['POST'])
-        def fill_input():
+        @self.route('POST', '/api/browser/fill')
+        def fill_input(data):
             """Fill a text input field."""
-            data = request.json or {}
+            data = data or {}
             text = data.get('text')
             element_id = data.get('element_id')
             selector = data.get('selector')
             
             if not text:
-                return jsonify({"error": "Missing 'text' field"}), 400
+                return {"error": "Missing 'text' field"}, 400
             
             if not any([element_id, selector]):
-                return jsonify({"error": "Must provide element_id or selector"}), 400
+                return {"error": "Must provide element_id or selector"}, 400
             
-            return jsonify(self.browser_controller.execute_browser_command(
+            return self.browser_controller.execute_browser_command(
                 'fill_input', 
                 text=text, 
                 element_id=element_id, 
                 selector=selector
-            ))
+            )
         
-        @self.app.route('/api/browser/back', methods=['POST'])
-        def go_back():
+        @self.route('POST', '/api/browser/back')
+        def go_back(data):
             """Navigate back in history."""
-            return jsonify(self.browser_controller.execute_browser_command('go_back'))
+            return self.browser_controller.execute_browser_command('go_back')
         
-        @self.app.route('/api/browser/forward', methods=['POST'])
-        def go_forward():
+        @self.route('POST', '/api/browser/forward')
+        def go_forward(data):
             """Navigate forward in history."""
-            return jsonify(self.browser_controller.execute_browser_command('go_forward'))
+            return self.browser_controller.execute_browser_command('go_forward')
         
-        @self.app.route('/api/browser/refresh', methods=['POST'])
-        def refresh():
+        @self.route('POST', '/api/browser/refresh')
+        def refresh(data):
             """Refresh the current page."""
-            return jsonify(self.browser_controller.execute_browser_command('refresh'))
+            return self.browser_controller.execute_browser_command('refresh')
         
-        @self.app.route('/api/terminal/execute', methods=['POST'])
-        def execute_terminal_command():
+        @self.route('POST', '/api/terminal/execute')
+        def execute_terminal_command(data):
             """Execute a command in the terminal."""
-            data = request.json or {}
+            data = data or {}
             command = data.get('command')
             
             if not command:
-                return jsonify({"error": "Missing 'command' field"}), 400
+                return {"error": "Missing 'command' field"}, 400
             
-            return jsonify(self.browser_controller.execute_terminal_command(
+            return self.browser_controller.execute_terminal_command(
                 'execute_command', 
                 command=command
-            ))
+            )
         
-        @self.app.route('/api/terminal/directory', methods=['GET'])
-        def get_current_directory():
+        @self.route('GET', '/api/terminal/directory')
+        def get_current_directory(data):
             """Get the current working directory of the terminal."""
-            return jsonify(self.browser_controller.execute_terminal_command('get_current_directory'))
+            return self.browser_controller.execute_terminal_command('get_current_directory')
         
-        @self.app.route('/api/chat/send', methods=['POST'])
-        def send_chat_message():
+        @self.route('POST', '/api/chat/send')
+        def send_chat_message(data):
             """Send a message to the AI chat."""
-            data = request.json or {}
+            data = data or {}
             message = data.get('message')
             ai = data.get('ai', 'Both AIs')
             
             if not message:
-                return jsonify({"error": "Missing 'message' field"}), 400
+                return {"error": "Missing 'message' field"}, 400
             
-            return jsonify(self.browser_controller.execute_chat_command(
+            return self.browser_controller.execute_chat_command(
                 'send_message', 
                 message=message, 
                 ai=ai
-            ))
+            )
     
     def start(self):
         """Start the server in a separate thread."""
@@ -206,9 +371,22 @@ class APIServer:
             logger.warning("Server is already running")
             return
         
+        wsgi_app = self if self.fast_dispatch else self.app
+        
+        if HAS_WAITRESS:
+            # Waitress serves requests from a worker thread pool
+            self._wsgi_server = waitress.create_server(
+                wsgi_app, host=self.host, port=self.port, threads=self.threads
+            )
+        
         def run_server():
             logger.info(f"Starting API server on {self.host}:{self.port}")
-            self.app.run(host=self.host, port=self.port, debug=False, use_reloader=False)
+            if self._wsgi_server is not None:
+                self._wsgi_server.run()
+            else:
+                logger.warning("waitress is not installed, falling back to the Flask development server")
+                # Handle each request on its own thread so slow commands don't block other clients
+                run_simple(self.host, self.port, wsgi_app, threaded=True, use_reloader=False, use_debugger=False)
         
         self.server_thread = threading.Thread(target=run_server)
         self.server_thread.daemon = True
@@ -223,15 +401,18 @@ class APIServer:
             logger.warning("Server is not running")
             return
         
-        # Flask doesn't provide a clean way to stop the server from another thread
-        # In a production environment, you would use a more robust server like gunicorn
-        # For now, we'll just set the flag and let the thread die when the application exits
+        if self._wsgi_server is not None:
+            self._wsgi_server.close()
+            self._wsgi_server = None
+        # Flask's development server can't be stopped from another thread,
+        # so in the fallback case the thread dies when the application exits
         self.is_running = False
         logger.info("API server stopping")
 
 
-def create_server(browser_controller: BrowserController, host: str = '127.0.0.1', port: int = 5000) -> APIServer:
+def create_server(browser_controller: BrowserController, host: str = '127.0.0.1', port: int = 5000,
+                  threads: int = 8, fast_dispatch: bool = True) -> APIServer:
     """Create and start an API server."""
-    server = APIServer(browser_controller, host, port)
+    server = APIServer(browser_controller, host, port, threads, fast_dispatch)
     server.start()
     return server
\ No newline at end of file
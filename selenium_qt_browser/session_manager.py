@@ -7,10 +7,83 @@ and notes.
 """
 
 import os
+import sys
 import json
+import zipfile
 import datetime
+from collections import Counter
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from PyQt6.QtCore import QObject, pyqtSignal
+from typing import Optional, List, Dict, Tuple, Any
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from selenium_qt_browser.tab_types import TabType
+
+# Optional fast JSON encoder
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when it is available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, default=asdict).encode("utf-8")
+
+
+def _loads(data):
+    """Deserialize JSON from str or bytes, using orjson when it is available."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write data to path through a temporary file so a crash never leaves it half-written."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+# slots=True needs Python 3.10; older interpreters get a regular dataclass
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
+class TabRecord:
+    """A saved tab entry in tabs.json."""
+    index: int
+    title: str
+    type: Optional[str] = None
+    url: Optional[str] = None
+    note_file: Optional[str] = None
+    sheet_file: Optional[str] = None
+
+
+@dataclass
+class SessionSnapshot:
+    """Plain-data copy of the session, taken on the UI thread and written by a worker."""
+    records: List[TabRecord]
+    note_members: List[Tuple[str, Any]]  # (archive member name, note text or sheet cells)
+    chat_logs: List[Dict[str, Any]]
+    history: List[Dict[str, Any]]
+    tab_types: Dict[str, int]
+
+
+class _SessionSaveTask(QRunnable):
+    """Writes a session snapshot to disk on a thread pool worker."""
+    
+    def __init__(self, session_manager, snapshot: SessionSnapshot):
+        super().__init__()
+        self.session_manager = session_manager
+        self.snapshot = snapshot
+    
+    def run(self):
+        try:
+            self.session_manager._write_session(self.snapshot)
+        except Exception as e:
+            print(f"Error saving session: {e}")
+
 
 class SessionManager(QObject):
     """Manages saving and loading of the last browser session."""
@@ -29,20 +102,46 @@ class SessionManager(QObject):
         (self.last_session_dir / "chat_logs").mkdir(exist_ok=True)
         (self.last_session_dir / "notes").mkdir(exist_ok=True)
         (self.last_session_dir / "history").mkdir(exist_ok=True)
+        
+        # Session files are written off the UI thread. A single worker keeps
+        # saves in order, so two saves never write the same files at once.
+        self._saver = QThreadPool(self)
+        self._saver.setMaxThreadCount(1)
     
-    def save_session(self, browser_window):
-        """Save the current session."""
-        # Save session data
-        self._save_tabs(browser_window)
-        self._save_chat_logs(browser_window)
+    def save_session(self, browser_window, wait=False):
+        """Save the current session; pass wait=True to block until it is written."""
+        # Walk the tab widget once and share the result between the snapshots
+        tabs = self._iter_tabs(browser_window)
+        
+        records, note_members = self._snapshot_tabs(tabs)
         self._save_notes(browser_window)
-        self._save_history(browser_window)
+        snapshot = SessionSnapshot(
+            records=records,
+            note_members=note_members,
+            chat_logs=self._snapshot_chat_logs(browser_window),
+            history=self._snapshot_history(tabs),
+            tab_types={
+                tab_type.name: count
+                for tab_type, count in Counter(tab_type for _, _, tab_type, _ in tabs if tab_type is not None).items()
+            }
+        )
         
-        # Update metadata
-        self._update_metadata(browser_window)
+        self._saver.start(_SessionSaveTask(self, snapshot))
+        if wait:
+            self._saver.waitForDone()
         
         return True
     
+    def _write_session(self, snapshot: SessionSnapshot):
+        """Write a session snapshot to disk (runs on the saver thread)."""
+        # Save session data
+        self._save_tabs(snapshot.records, snapshot.note_members)
+        self._save_chat_logs(snapshot.chat_logs)
+        self._save_history(snapshot.history)
+        
+        # Update metadata
+        self._update_metadata(len(snapshot.records), snapshot.tab_types)
+    
     def load_last_session(self, browser_window):
         """Load the last session if it exists."""
         tabs_file = self.last_session_dir / "tabs.json"
@@ -61,142 +160,117 @@ class SessionManager(QObject):
             print(f"Error loading last session: {e}")
             return False
     
-    def _save_tabs(self, browser_window):
-        """Save the open tabs."""
+    def _iter_tabs(self, browser_window):
+        """Return a list of (index, widget, TabType or None, title) for every open tab."""
+        tab_widget = browser_window.tab_widget
         tabs = []
+        for i in range(tab_widget.count()):
+            tab = tab_widget.widget(i)
+            tab_type = getattr(tab, "tab_type", None)
+            tabs.append((i, tab, tab_type, tab_widget.tabText(i)))
+        return tabs
+    
+    def _snapshot_tabs(self, tabs):
+        """Collect the tab records and the note/sheet payloads to archive."""
+        records = []
+        note_members = []
         
-        # Iterate through all tabs
-        for i in range(browser_window.tab_widget.count()):
-            tab = browser_window.tab_widget.widget(i)
-            tab_data = {
-                "index": i,
-                "title": browser_window.tab_widget.tabText(i)
-            }
+        for i, tab, tab_type, title in tabs:
+            record = TabRecord(index=i, title=title, type=tab_type.name if tab_type is not None else None)
             
             # Save tab-specific data based on type
-            if hasattr(tab, "tab_type"):
-                tab_data["type"] = tab.tab_type.name
-                
-                if tab.tab_type.name == "BROWSER":
-                    tab_data["url"] = tab.current_url()
-                elif tab.tab_type.name == "NOTEPAGE":
-                    # For NotePage, save the content to a separate file
-                    note_file = f"note_{i}.txt"
-                    with open(self.last_session_dir / "notes" / note_file, "w") as f:
-                        f.write(tab.text_editor.toPlainText())
-                    tab_data["note_file"] = note_file
-                elif tab.tab_type.name == "NOTEPAGE_EXC":
-                    # For NotePageExc, save the spreadsheet data to a separate file
-                    sheet_file = f"sheet_{i}.json"
-                    with open(self.last_session_dir / "notes" / sheet_file, "w") as f:
-                        json.dump(tab.spreadsheet_model.data, f)
-                    tab_data["sheet_file"] = sheet_file
+            if tab_type is TabType.BROWSER:
+                record.url = tab.current_url()
+            elif tab_type is TabType.NOTEPAGE:
+                # For NotePage, save the content as an archive member
+                record.note_file = f"notes/note_{i}.txt"
+                note_members.append((record.note_file, tab.text_editor.toPlainText()))
+            elif tab_type is TabType.NOTEPAGE_EXC:
+                # For NotePageExc, save the spreadsheet cells as [row, col, value] triples
+                record.sheet_file = f"notes/sheet_{i}.json"
+                cells = [[r, c, v] for (r, c), v in tab.spreadsheet_model.data.items()]
+                note_members.append((record.sheet_file, cells))
             
-            tabs.append(tab_data)
+            records.append(record)
         
-        # Save tabs data
-        with open(self.last_session_dir / "tabs.json", "w") as f:
-            json.dump(tabs, f, indent=2)
+        return records, note_members
     
-    def _save_chat_logs(self, browser_window):
-        """Save the chat logs."""
-        chat_logs = []
+    def _save_tabs(self, records, note_members):
+        """Save the open tabs."""
+        # Note and sheet contents all go into a single archive
+        notes_archive = self.last_session_dir / "notes.zip"
+        notes_tmp = notes_archive.with_suffix(".zip.tmp")
+        with zipfile.ZipFile(notes_tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, payload in note_members:
+                zf.writestr(name, payload if isinstance(payload, str) else _dumps(payload))
         
-        # Iterate through all tabs to find chat tabs
-        for i in range(browser_window.tab_widget.count()):
-            tab = browser_window.tab_widget.widget(i)
-            
-            if hasattr(tab, "tab_type") and tab.tab_type.name == "CHAT":
-                # Extract chat messages
-                messages = []
-                
-                # This assumes the chat tab has a chat_layout with message widgets
-                if hasattr(tab, "chat_layout"):
-                    for j in range(tab.chat_layout.count()):
-                        widget = tab.chat_layout.itemAt(j).widget()
-                        if hasattr(widget, "sender_label") and hasattr(widget, "message_label"):
-                            messages.append({
-                                "sender": widget.sender_label.text(),
-                                "message": widget.message_label.text(),
-                                "timestamp": widget.timestamp.text()
-                            })
-                
-                chat_logs.append({
-                    "tab_index": i,
-                    "messages": messages
-                })
+        os.replace(notes_tmp, notes_archive)
         
-        # Save chat logs
-        with open(self.last_session_dir / "chat_logs" / "chats.json", "w") as f:
-            json.dump(chat_logs, f, indent=2)
+        # Save tabs data
+        _write_atomic(self.last_session_dir / "tabs.json", _dumps(records, indent=True))
+    
+    def _snapshot_chat_logs(self, browser_window):
+        """Collect the chat logs."""
+        # Chat tabs keep their messages as plain data, so no widget traversal is needed
+        return [
+            {
+                "tab_index": browser_window.tab_widget.indexOf(tab),
+                "messages": list(tab._messages)
+            }
+            for tab in browser_window._chat_tabs
+        ]
+    
+    def _save_chat_logs(self, chat_logs):
+        """Save the chat logs."""
+        _write_atomic(self.last_session_dir / "chat_logs" / "chats.json", _dumps(chat_logs, indent=True))
     
     def _save_notes(self, browser_window):
         """Save the notes."""
         # Notes are saved in _save_tabs
         pass
     
-    def _save_history(self, browser_window):
+    def _snapshot_history(self, tabs):
+        """Collect the current URL of every browser tab as history entries."""
+        timestamp = datetime.datetime.now().isoformat()
+        return [
+            {
+                "url": tab.current_url(),
+                "title": title,
+                "timestamp": timestamp
+            }
+            for i, tab, tab_type, title in tabs
+            if tab_type is TabType.BROWSER
+        ]
+    
+    def _save_history(self, history):
         """Save the browsing history."""
-        history = []
-        
-        # Iterate through all tabs to find browser tabs
-        for i in range(browser_window.tab_widget.count()):
-            tab = browser_window.tab_widget.widget(i)
-            
-            if hasattr(tab, "tab_type") and tab.tab_type.name == "BROWSER":
-                # Add current URL to history
-                history.append({
-                    "url": tab.current_url(),
-                    "title": browser_window.tab_widget.tabText(i),
-                    "timestamp": datetime.datetime.now().isoformat()
-                })
-        
-        # Save history
-        history_file = self.last_session_dir / "history" / "history.json"
-        
-        # Append to existing history if file exists
-        if history_file.exists():
-            try:
-                with open(history_file, "r") as f:
-                    existing_history = json.load(f)
-                history = existing_history + history
-            except Exception as e:
-                print(f"Error loading existing history: {e}")
-        
-        with open(history_file, "w") as f:
-            json.dump(history, f, indent=2)
+        # Append the new entries to the history log, one JSON object per line
+        history_file = self.last_session_dir / "history" / "history.jsonl"
+        with open(history_file, "ab") as f:
+            f.write(b"".join(_dumps(entry) + b"\n" for entry in history))
     
-    def _update_metadata(self, browser_window):
+    def _update_metadata(self, tab_count, tab_types):
         """Update the session metadata."""
         metadata_file = self.last_session_dir / "metadata.json"
+        now = datetime.datetime.now()
+        iso = now.isoformat()
         
         try:
-            with open(metadata_file, "r") as f:
-                metadata = json.load(f)
+            metadata = _loads(metadata_file.read_bytes())
         except Exception:
             # Create new metadata if file doesn't exist or is invalid
             metadata = {
                 "name": "Last Session",
-                "created": datetime.datetime.now().isoformat()
+                "created": iso
             }
         
         # Update metadata
-        metadata["updated"] = datetime.datetime.now().isoformat()
-        metadata["timestamp"] = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        metadata["tab_count"] = browser_window.tab_widget.count()
-        
-        # Count tab types
-        tab_types = {}
-        for i in range(browser_window.tab_widget.count()):
-            tab = browser_window.tab_widget.widget(i)
-            if hasattr(tab, "tab_type"):
-                tab_type = tab.tab_type.name
-                tab_types[tab_type] = tab_types.get(tab_type, 0) + 1
-        
+        metadata["updated"] = iso
+        metadata["timestamp"] = now.strftime("%Y%m%d_%H%M%S")
+        metadata["tab_count"] = tab_count
         metadata["tab_types"] = tab_types
         
-        with open(metadata_file, "w") as f:
-            json.dump(metadata, f, indent=2)
+        _write_atomic(metadata_file, _dumps(metadata, indent=True))
     
     def _load_tabs(self, browser_window):
         """Load the tabs from the last session."""
@@ -205,61 +279,62 @@ class SessionManager(QObject):
             return
         
         try:
-            with open(tabs_file, "r") as f:
-                tabs_data = json.load(f)
+            tabs_data = _loads(tabs_file.read_bytes())
             
             # Close all existing tabs
             while browser_window.tab_widget.count() > 0:
                 browser_window.close_tab(0)
             
-            # Create new tabs based on saved data
-            for tab_data in tabs_data:
-                tab_type = tab_data.get("type")
-                
-                if tab_type == "BROWSER":
-                    tab = browser_window.add_new_tab(tab_data.get("url"))
-                elif tab_type == "CHAT":
-                    tab = browser_window.add_new_chat_tab()
-                elif tab_type == "TERMINAL":
-                    tab = browser_window.add_new_terminal_tab()
-                elif tab_type == "NOTEPAGE":
-                    tab = browser_window.add_new_notepage_tab()
-                    # Load note content
-                    note_file = tab_data.get("note_file")
-                    if note_file:
-                        note_path = self.last_session_dir / "notes" / note_file
-                        if note_path.exists():
-                            with open(note_path, "r") as f:
-                                tab.text_editor.setPlainText(f.read())
-                elif tab_type == "NOTEPAGE_EXC":
-                    tab = browser_window.add_new_notepage_exc_tab()
-                    # Load spreadsheet data
-                    sheet_file = tab_data.get("sheet_file")
-                    if sheet_file:
-                        sheet_path = self.last_session_dir / "notes" / sheet_file
-                        if sheet_path.exists():
-                            with open(sheet_path, "r") as f:
-                                # Convert string keys back to tuple keys
-                                data = json.load(f)
-                                converted_data = {}
-                                for k, v in data.items():
-                                    # Convert string key like "(0,1)" to tuple (0,1)
-                                    if k.startswith("(") and k.endswith(")"):
-                                        parts = k[1:-1].split(",")
-                                        if len(parts) == 2:
-                                            try:
-                                                key = (int(parts[0]), int(parts[1]))
-                                                converted_data[key] = v
-                                            except ValueError:
-                                                converted_data[k] = v
-                                    else:
-                                        converted_data[k] = v
-                                tab.spreadsheet_model.data = converted_data
-                                tab.spreadsheet_model.layoutChanged.emit()
+            notes_archive = self.last_session_dir / "notes.zip"
+            zf = zipfile.ZipFile(notes_archive, "r") if notes_archive.exists() else None
+            
+            try:
+                # Create new tabs based on saved data
+                for tab_data in tabs_data:
+                    # Resolve the saved name to a TabType once per tab
+                    tab_type = TabType.__members__.get(tab_data.get("type"))
+                    
+                    if tab_type is TabType.BROWSER:
+                        tab = browser_window.add_new_tab(tab_data.get("url"))
+                    elif tab_type is TabType.CHAT:
+                        tab = browser_window.add_new_chat_tab()
+                    elif tab_type is TabType.TERMINAL:
+                        tab = browser_window.add_new_terminal_tab()
+                    elif tab_type is TabType.NOTEPAGE:
+                        tab = browser_window.add_new_notepage_tab()
+                        # Load note content
+                        content = self._read_note_member(zf, tab_data.get("note_file"))
+                        if content is not None:
+                            tab.text_editor.setPlainText(content.decode("utf-8"))
+                    elif tab_type is TabType.NOTEPAGE_EXC:
+                        tab = browser_window.add_new_notepage_exc_tab()
+                        # Load spreadsheet data
+                        content = self._read_note_member(zf, tab_data.get("sheet_file"))
+                        if content is not None:
+                            tab.spreadsheet_model.data = {(r, c): v for r, c, v in _loads(content)}
+                            tab.spreadsheet_model.layoutChanged.emit()
+            finally:
+                if zf is not None:
+                    zf.close()
         except Exception as e:
             print(f"Error loading tabs: {e}")
             raise
     
+    def _read_note_member(self, zf, name):
+        """Read a note or sheet payload from the notes archive, or None if it is missing."""
+        if not name:
+            return None
+        if zf is not None:
+            try:
+                return zf.read(name)
+            except KeyError:
+                pass
+        # Sessions saved before the archive existed keep one file per note
+        legacy_path = self.last_session_dir / "notes" / os.path.basename(name)
+        if legacy_path.exists():
+            return legacy_path.read_bytes()
+        return None
+    
     def _load_chat_logs(self, browser_window):
         """Load the chat logs from the last session."""
         chat_logs_file = self.last_session_dir / "chat_logs" / "chats.json"
@@ -267,8 +342,7 @@ class SessionManager(QObject):
             return
         
         try:
-            with open(chat_logs_file, "r") as f:
-                chat_logs = json.load(f)
+            chat_logs = _loads(chat_logs_file.read_bytes())
             
             # Find chat tabs and populate with messages
             for chat_log in chat_logs:
@@ -281,7 +355,7 @@ class SessionManager(QObject):
                 # Check if there's already a chat tab at this index
                 if tab_index < browser_window.tab_widget.count():
                     tab = browser_window.tab_widget.widget(tab_index)
-                    if hasattr(tab, "tab_type") and tab.tab_type.name == "CHAT":
+                    if getattr(tab, "tab_type", None) is TabType.CHAT:
                         chat_tab = tab
                 
                 # If no chat tab found, create a new one
@@ -289,11 +363,7 @@ class SessionManager(QObject):
                     chat_tab = browser_window.add_new_chat_tab()
                 
                 # Clear existing messages
-                if hasattr(chat_tab, "chat_layout"):
-                    while chat_tab.chat_layout.count() > 0:
-                        item = chat_tab.chat_layout.takeAt(0)
-                        if item.widget():
-                            item.widget().deleteLater()
+                chat_tab.clear_messages()
                 
                 # Add messages
                 for message in messages:
@@ -312,5 +382,6 @@ class SessionManager(QObject):
     def _load_history(self, browser_window):
         """Load the browsing history from the last session."""
         # History is loaded in _load_tabs (for open tabs)
-        # We could also populate a history menu/list here if needed
+        # We could also populate a history menu/list here if needed, reading
+        # history/history.jsonl one line (one entry) at a time
         pass
\ No newline at end of file
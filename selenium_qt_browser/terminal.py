@@ -6,17 +6,94 @@ accessing and interacting with the system terminal.
 """
 
 import os
+import re
 import sys
+import codecs
+import signal
 import platform
+import functools
+import threading
 import subprocess
 from pathlib import Path
 
-from PyQt6.QtCore import Qt, QProcess, pyqtSlot, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QProcess, pyqtSlot, pyqtSignal, QTimer, QSocketNotifier
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QLineEdit,
-    QPushButton, QLabel, QPlainTextEdit
+    QPushButton, QLabel, QPlainTextEdit, QSizePolicy
 )
-from PyQt6.QtGui import QFont, QTextCursor, QColor
+from PyQt6.QtGui import (
+    QFont, QTextCursor, QColor, QTextCharFormat, QFontMetrics,
+    QPainter, QPixmap, QStaticText
+)
+
+# Pseudo-terminals are POSIX only; Windows falls back to a QProcess running cmd.exe
+try:
+    import pty
+    import termios
+    HAS_PTY = True
+except ImportError:
+    HAS_PTY = False
+
+# Host platform, looked up once
+_SYSTEM = platform.system()
+_IS_WIN = _SYSTEM == "Windows"
+
+# Process output is buffered and appended at most once per this many milliseconds
+OUTPUT_FLUSH_INTERVAL_MS = 16
+# A trailing line without a newline (a prompt, a progress bar) is shown after this much quiet
+PARTIAL_LINE_TIMEOUT_MS = 100
+# Scrollback limit; older lines are dropped so appends don't slow down over time
+MAX_SCROLLBACK_BLOCKS = 5000
+# Read stderr through stdout so interleaved output costs one signal per burst.
+# Set to False to get stderr on its own channel, shown in red. Only applies to
+# the QProcess shell; the pty shell always writes both streams to the pty.
+MERGE_STDERR = True
+# Maximum bytes read from the pty per readiness notification
+PTY_READ_SIZE = 65536
+# How often, and how many times, an exited pty shell is polled before it is killed
+PTY_REAP_POLL_MS = 50
+PTY_REAP_ATTEMPTS = 20
+
+_WELCOME_TEXT = """
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                                                                              ║
+║                            JORDAN AI TERMINAL                                ║
+║                                                                              ║
+║                                                                              ║
+║        ░░░░░██╗░█████╗░██████╗░██████╗░░█████╗░███╗░░██╗  ░█████╗░██╗        ║
+║        ░░░░░██║██╔══██╗██╔══██╗██╔══██╗██╔══██╗████╗░██║  ██╔══██╗██║        ║
+║        ░░░░░██║██║░░██║██████╔╝██║░░██║███████║██╔██╗██║  ███████║██║        ║
+║        ██╗░░██║██║░░██║██╔══██╗██║░░██║██╔══██║██║╚████║  ██╔══██║██║        ║
+║        ╚█████╔╝╚█████╔╝██║░░██║██████╔╝██║░░██║██║░╚███║  ██║░░██║██║        ║
+║        ░╚════╝░░╚════╝░╚═╝░░╚═╝╚═════╝░╚═╝░░╚═╝╚═╝░░╚══╝  ╚═╝░░╚═╝╚═╝        ║
+║                                                                              ║
+║                                                                              ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+_SYS_INFO_TEMPLATE = (
+    "\n╔═══ SYSTEM INFO " + "═" * 50 + "\n"
+    "║ OS      : {os}\n"
+    "║ Python  : {py}\n"
+    "║ Path    : {cwd}\n"
+    "╚" + "═" * 63 + "\n"
+    "\nType 'help' for available commands\n"
+)
+
+
+def _reap_shell(process):
+    """Hang up a pty shell's process group and wait for it, killing it if it lingers."""
+    for sig, timeout in ((signal.SIGHUP, 1), (signal.SIGKILL, None)):
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            process.wait(timeout=timeout)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
 
 class TerminalTab(QWidget):
     """A tab for accessing and interacting with the system terminal."""
@@ -25,6 +102,34 @@ class TerminalTab(QWidget):
         super().__init__(parent)
         self.parent = parent
         self.process = None
+        
+        # Master side of the shell's pty and the notifier watching it (pty shells only)
+        self._pty_master = None
+        self._notifier = None
+        
+        # Shell's working directory as last known, used by the output spam filter.
+        # Only refreshed when a cd command is sent, not on every read.
+        self._set_cwd_cache(os.getcwd())
+        
+        # Output received since the last flush, appended in one edit by _flush_output
+        self._pending_out = bytearray()
+        self._pending_err = bytearray()
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(OUTPUT_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_output)
+        # False once a message line was appended, so the next output starts on a new line
+        self._at_output_tail = False
+        
+        # Output is appended a line at a time; an unterminated tail waits for this timer.
+        # The incremental decoders keep a UTF-8 sequence split across reads intact.
+        self._out_decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        self._err_decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        self._partial_timer = QTimer(self)
+        self._partial_timer.setSingleShot(True)
+        self._partial_timer.setInterval(PARTIAL_LINE_TIMEOUT_MS)
+        self._partial_timer.timeout.connect(self._flush_partial_lines)
+        
         self.setup_ui()
         self.start_process()
     
@@ -33,9 +138,25 @@ class TerminalTab(QWidget):
         # Create main layout
         main_layout = QVBoxLayout(self)
         
+        # Welcome banner, drawn once into a pixmap instead of laid out as document text
+        self._banner_label = QLabel()
+        self._banner_label.setPixmap(self._render_banner(QFont("Courier New", 11)))
+        self._banner_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Fixed)
+        self._banner_label.setStyleSheet("background-color: #121212; border-radius: 6px;")
+        main_layout.addWidget(self._banner_label)
+        
         # Create terminal output area with modern styling
         self.terminal_output = QPlainTextEdit()
         self.terminal_output.setReadOnly(True)
+        self.terminal_output.setMaximumBlockCount(MAX_SCROLLBACK_BLOCKS)
+        self.terminal_output.setCenterOnScroll(False)
+        self.terminal_output.document().setUndoRedoEnabled(False)
+        
+        # Text formats are built once and reused for every insert
+        self._normal_fmt = QTextCharFormat()
+        self._normal_fmt.setForeground(QColor("#f0f0f0"))
+        self._err_fmt = QTextCharFormat()
+        self._err_fmt.setForeground(QColor("red"))
         self.terminal_output.setFont(QFont("Courier New", 11))
         self.terminal_output.setStyleSheet("""
             background-color: #121212;
@@ -96,102 +217,281 @@ class TerminalTab(QWidget):
         """)
         main_layout.addWidget(self.dir_label)
     
+    def _render_banner(self, font):
+        """Render the welcome banner into a pixmap in bright cyan."""
+        text = _WELCOME_TEXT.strip("\n")
+        metrics = QFontMetrics(font)
+        lines = text.split("\n")
+        width = max(metrics.horizontalAdvance(line) for line in lines)
+        height = metrics.lineSpacing() * len(lines)
+        
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(width * ratio), int(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(QColor("#121212"))
+        
+        static_text = QStaticText(text)
+        static_text.setTextFormat(Qt.TextFormat.PlainText)
+        
+        painter = QPainter(pixmap)
+        painter.setFont(font)
+        painter.setPen(QColor("#00FFFF"))
+        painter.drawStaticText(0, 0, static_text)
+        painter.end()
+        return pixmap
+    
     def display_welcome_message(self):
-        """Display a stylish welcome message in the terminal."""
-        welcome_text = """
-╔══════════════════════════════════════════════════════════════════════════════╗
-║                                                                              ║
-║                            JORDAN AI TERMINAL                                ║
-║                                                                              ║
-║                                                                              ║
-║        ░░░░░██╗░█████╗░██████╗░██████╗░░█████╗░███╗░░██╗  ░█████╗░██╗        ║
-║        ░░░░░██║██╔══██╗██╔══██╗██╔══██╗██╔══██╗████╗░██║  ██╔══██╗██║        ║
-║        ░░░░░██║██║░░██║██████╔╝██║░░██║███████║██╔██╗██║  ███████║██║        ║
-║        ██╗░░██║██║░░██║██╔══██╗██║░░██║██╔══██║██║╚████║  ██╔══██║██║        ║
-║        ╚█████╔╝╚█████╔╝██║░░██║██████╔╝██║░░██║██║░╚███║  ██║░░██║██║        ║
-║        ░╚════╝░░╚════╝░╚═╝░░╚═╝╚═════╝░╚═╝░░╚═╝╚═╝░░╚══╝  ╚═╝░░╚═╝╚═╝        ║
-║                                                                              ║
-║                                                                              ║
-╚══════════════════════════════════════════════════════════════════════════════╝
-"""
-        # Set text color to a vibrant teal for the welcome message
-        cursor = self.terminal_output.textCursor()
-        format = cursor.charFormat()
-        format.setForeground(QColor("#00FFFF"))  # Bright cyan
-        cursor.setCharFormat(format)
-        
-        self.terminal_output.appendPlainText(welcome_text)
-        
-        # Reset text color
-        format.setForeground(QColor("#f0f0f0"))
-        cursor.setCharFormat(format)
-        
-        # Add system info with modern styling
-        self.terminal_output.appendPlainText("╔═══ SYSTEM INFO " + "═" * 50)
-        self.terminal_output.appendPlainText(f"║ OS      : {platform.system()} {platform.release()}")
-        self.terminal_output.appendPlainText(f"║ Python  : {platform.python_version()}")
-        self.terminal_output.appendPlainText(f"║ Path    : {os.getcwd()}")
-        self.terminal_output.appendPlainText("╚" + "═" * 63)
-        self.terminal_output.appendPlainText("\nType 'help' for available commands\n")
+        """Display the system info below the welcome banner."""
+        output = self.terminal_output
+        cursor = output.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not output.document().isEmpty():
+            # The shell was restarted; start below the existing output
+            cursor.insertBlock()
+        
+        cursor.insertText(_SYS_INFO_TEMPLATE.format(
+            os=f"{_SYSTEM} {platform.release()}",
+            py=platform.python_version(),
+            cwd=os.getcwd()
+        ), self._normal_fmt)
+        
+        output.moveCursor(QTextCursor.MoveOperation.End)
     
     def start_process(self):
         """Start the terminal process."""
+        if HAS_PTY:
+            self.display_welcome_message()
+            self._start_pty_process()
+            return
+        
         self.process = QProcess()
         self.process.readyReadStandardOutput.connect(self.handle_stdout)
-        self.process.readyReadStandardError.connect(self.handle_stderr)
+        if MERGE_STDERR:
+            self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        else:
+            self.process.readyReadStandardError.connect(self.handle_stderr)
         self.process.finished.connect(self.process_finished)
         
         # Display the welcome message
         self.display_welcome_message()
         
         # Determine the shell to use based on the platform
-        if platform.system() == "Windows":
+        if _IS_WIN:
             self.process.start("cmd.exe")
         else:  # Unix-like systems (macOS, Linux)
             # Use /bin/sh (root shell) instead of user's shell
             shell = "/bin/sh"
             self.process.start(shell)
     
+    def _start_pty_process(self):
+        """Start /bin/sh on a pseudo-terminal and watch the master side for output."""
+        master, slave = pty.openpty()
+        
+        # No local echo (the command is already shown) and no \n -> \r\n translation
+        attrs = termios.tcgetattr(slave)
+        attrs[1] &= ~termios.ONLCR
+        attrs[3] &= ~termios.ECHO
+        termios.tcsetattr(slave, termios.TCSANOW, attrs)
+        
+        # The prompt label stands in for the shell's own prompts; no color escapes
+        env = dict(os.environ, PS1="", PS2="", TERM="dumb")
+        try:
+            # setsid happens in subprocess's C child code. Reopening the slave by path
+            # from the new session then makes it the controlling terminal, with no
+            # Python running between fork and exec.
+            self.process = subprocess.Popen(
+                ["/bin/sh", "-c", 'exec /bin/sh <>"$1" >&0 2>&0', "sh", os.ttyname(slave)],
+                stdin=slave, stdout=slave, stderr=slave,
+                env=env,
+                start_new_session=True
+            )
+        except OSError as e:
+            os.close(master)
+            self.process = None
+            self._append_line(f"Error starting shell: {str(e)}")
+            return
+        finally:
+            os.close(slave)
+        
+        self._pty_master = master
+        self._notifier = QSocketNotifier(master, QSocketNotifier.Type.Read, self)
+        self._notifier.activated.connect(self._on_pty_read)
+    
+    @pyqtSlot()
+    def _on_pty_read(self):
+        """Read what the shell wrote to the pty, up to PTY_READ_SIZE bytes per wakeup."""
+        try:
+            raw = os.read(self._pty_master, PTY_READ_SIZE)
+        except OSError:
+            # EIO once the shell has exited and its side of the pty is gone
+            raw = b""
+        
+        if not raw:
+            self._on_pty_closed()
+            return
+        
+        self._queue_output(raw, self._pending_out)
+    
+    def _close_pty(self):
+        """Stop watching the pty and close its master side."""
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+        if self._pty_master is not None:
+            os.close(self._pty_master)
+            self._pty_master = None
+    
+    def _on_pty_closed(self):
+        """Stop reading from the exited pty shell and reap it without blocking."""
+        self._close_pty()
+        self._poll_pty_exit(self.process, 0)
+    
+    def _poll_pty_exit(self, process, attempts):
+        """Report the pty shell's exit like a finished QProcess once it can be reaped."""
+        if process is not self.process:
+            # The tab was shut down or the shell replaced in the meantime
+            return
+        
+        exit_code = process.poll()
+        if exit_code is None:
+            if attempts >= PTY_REAP_ATTEMPTS:
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except (ProcessLookupError, PermissionError):
+                    pass
+            QTimer.singleShot(PTY_REAP_POLL_MS, functools.partial(self._poll_pty_exit, process, attempts + 1))
+            return
+        
+        if exit_code < 0:
+            exit_status = QProcess.ExitStatus.CrashExit
+        else:
+            exit_status = QProcess.ExitStatus.NormalExit
+        self.process_finished(exit_code, exit_status)
+    
+    def _process_running(self):
+        """Return True if the shell process exists and has not exited."""
+        if self.process is None:
+            return False
+        if isinstance(self.process, QProcess):
+            return self.process.state() == QProcess.ProcessState.Running
+        return self._pty_master is not None and self.process.poll() is None
+    
+    def _write_to_process(self, data):
+        """Send data to the shell's stdin."""
+        if isinstance(self.process, QProcess):
+            self.process.write(data)
+            return
+        
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._pty_master, view):]
+    
+    def _queue_output(self, raw, pending):
+        """Buffer raw process output for the next flush, dropping directory spam."""
+        # Filter out directory spam (common pattern in shell output).
+        # Checked on the raw bytes; only retained output is decoded, at flush time.
+        
+        # A single line (no newline) mentioning /Users/; bytes.find is a C-level scan
+        if raw.find(b'\n') == -1 and raw.find(b'/Users/') != -1:
+            return
+        # The bare working directory, matched without stripping a copy of the chunk
+        if self._cwd_re.fullmatch(raw):
+            return
+        
+        pending += raw
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
     def handle_stdout(self):
         """Handle standard output from the process."""
         try:
-            if self.process and self.process.state() == QProcess.ProcessState.Running:
-                data = self.process.readAllStandardOutput().data().decode()
-                
-                # Filter out directory spam (common pattern in shell output)
-                if data.strip() == os.getcwd() or '/Users/' in data and '\n' not in data:
-                    return
-                
-                self.terminal_output.appendPlainText(data)
-                self.terminal_output.moveCursor(QTextCursor.MoveOperation.End)
+            if self._process_running():
+                self._queue_output(self.process.readAllStandardOutput().data(), self._pending_out)
         except Exception as e:
-            self.terminal_output.appendPlainText(f"Error reading output: {str(e)}")
+            self._append_line(f"Error reading output: {str(e)}")
     
     def handle_stderr(self):
         """Handle standard error from the process."""
         try:
-            if self.process and self.process.state() == QProcess.ProcessState.Running:
-                data = self.process.readAllStandardError().data().decode()
-                
-                # Filter out directory spam (common pattern in shell output)
-                if data.strip() == os.getcwd() or '/Users/' in data and '\n' not in data:
-                    return
-                
-                # Set text color to red for errors
-                cursor = self.terminal_output.textCursor()
-                format = cursor.charFormat()
-                format.setForeground(QColor("red"))
-                cursor.setCharFormat(format)
-                
-                self.terminal_output.appendPlainText(data)
+            if self._process_running():
+                self._queue_output(self.process.readAllStandardError().data(), self._pending_err)
+        except Exception as e:
+            self._append_line(f"Error reading error output: {str(e)}")
+    
+    def _set_cwd_cache(self, path):
+        """Remember the shell's working directory and rebuild its spam-filter pattern."""
+        self._cwd_cache = path
+        self._cwd_re = re.compile(rb'\s*' + re.escape(os.fsencode(path)) + rb'\s*')
+    
+    def _track_cd(self, command):
+        """Update the cached working directory after a cd command is sent to the shell."""
+        if command != "cd" and not command.startswith(("cd ", "cd\t")):
+            return
+        
+        target = command[2:].strip() or "~"
+        path = os.path.normpath(os.path.join(self._cwd_cache, os.path.expanduser(target)))
+        if os.path.isdir(path):
+            self._set_cwd_cache(path)
+    
+    @staticmethod
+    def _take_output(pending, decoder, whole):
+        """Remove buffered bytes through the last newline (or all if whole) and decode them."""
+        end = len(pending) if whole else pending.rfind(b'\n') + 1
+        if not end:
+            return ""
+        text = decoder.decode(bytes(pending[:end]))
+        del pending[:end]
+        return text
+    
+    def _flush_output(self, whole=False):
+        """Append the complete lines of buffered process output to the terminal in a single edit."""
+        if not self._pending_out and not self._pending_err:
+            return
+        
+        out_text = self._take_output(self._pending_out, self._out_decoder, whole)
+        err_text = self._take_output(self._pending_err, self._err_decoder, whole)
+        
+        if out_text or err_text:
+            output = self.terminal_output
+            # Only follow the output if the user hasn't scrolled up to read earlier lines
+            scrollbar = output.verticalScrollBar()
+            follow = scrollbar.value() == scrollbar.maximum()
+            
+            output.setUpdatesEnabled(False)
+            try:
+                cursor = output.textCursor()
+                cursor.movePosition(QTextCursor.MoveOperation.End)
+                if not self._at_output_tail and not output.document().isEmpty():
+                    cursor.insertBlock()
+                self._at_output_tail = True
                 
-                # Reset text color
-                format.setForeground(QColor("#f0f0f0"))
-                cursor.setCharFormat(format)
+                if out_text:
+                    cursor.insertText(out_text, self._normal_fmt)
                 
-                self.terminal_output.moveCursor(QTextCursor.MoveOperation.End)
-        except Exception as e:
-            self.terminal_output.appendPlainText(f"Error reading error output: {str(e)}")
+                if err_text:
+                    # Errors are shown in red
+                    cursor.insertText(err_text, self._err_fmt)
+            finally:
+                output.setUpdatesEnabled(True)
+            
+            # One scroll per flush, not per chunk
+            if follow:
+                output.moveCursor(QTextCursor.MoveOperation.End)
+                output.ensureCursorVisible()
+        
+        # Restarted on every flush, so the tail is only forced out once output goes quiet
+        if self._pending_out or self._pending_err:
+            self._partial_timer.start()
+    
+    def _append_line(self, text):
+        """Append a message (not process output) to the terminal as its own line."""
+        self.terminal_output.appendPlainText(text)
+        self._at_output_tail = False
+    
+    def _flush_partial_lines(self):
+        """Append buffered output including an unterminated last line."""
+        self._flush_output(whole=True)
     
     def execute_command(self):
         """Execute the command entered by the user."""
@@ -207,29 +507,35 @@ class TerminalTab(QWidget):
         
         # Special handling for exit/quit commands
         if command in ["exit", "quit"]:
-            self.terminal_output.appendPlainText("Cannot exit the terminal in this interface.")
+            self._append_line("Cannot exit the terminal in this interface.")
             self.command_input.clear()
             return
         
         try:
-            if self.process and self.process.state() == QProcess.ProcessState.Running:
+            if self._process_running():
                 # Display the command in the terminal output
-                self.terminal_output.appendPlainText(f"$ {command}")
+                self._append_line(f"$ {command}")
                 
                 # Write the command to the process
-                self.process.write(f"{command}\n".encode())
+                self._write_to_process(f"{command}\n".encode())
+                self._track_cd(command)
                 
                 # Clear the command input
                 self.command_input.clear()
             else:
-                self.terminal_output.appendPlainText("Terminal process is not running. Restarting...")
+                self._append_line("Terminal process is not running. Restarting...")
                 self.start_process()
                 # Try again after restarting
-                QTimer.singleShot(500, lambda: self.process.write(f"{command}\n".encode()))
+                QTimer.singleShot(500, functools.partial(self._deferred_write, f"{command}\n".encode()))
         except Exception as e:
-            self.terminal_output.appendPlainText(f"Error executing command: {str(e)}")
+            self._append_line(f"Error executing command: {str(e)}")
             self.command_input.clear()
     
+    def _deferred_write(self, data):
+        """Write data to the shell process current at call time, if it is running."""
+        if self._process_running():
+            self._write_to_process(data)
+    
     def update_current_directory(self):
         """Update the current directory display."""
         # Don't automatically run pwd/cd commands after each command
@@ -238,18 +544,35 @@ class TerminalTab(QWidget):
     
     def process_finished(self, exit_code, exit_status):
         """Handle process termination."""
-        self.terminal_output.appendPlainText(f"\nProcess terminated with exit code: {exit_code}")
+        # Show whatever the shell printed before it exited ahead of the notice
+        self._flush_output(whole=True)
+        self._append_line(f"\nProcess terminated with exit code: {exit_code}")
         
         # Restart the process if it terminated
         self.start_process()
     
-    def closeEvent(self, event):
-        """Handle tab close event."""
+    def shutdown(self):
+        """Stop the shell for good: no restart, no open pty and no unreaped child."""
+        process, self.process = self.process, None
+        self._flush_timer.stop()
+        self._partial_timer.stop()
         try:
-            if self.process and self.process.state() == QProcess.ProcessState.Running:
-                self.process.terminate()
-                self.process.waitForFinished(1000)
-                if self.process.state() == QProcess.ProcessState.Running:
-                    self.process.kill()
+            if isinstance(process, subprocess.Popen):
+                # Interactive shells ignore SIGTERM; hang up the session instead and
+                # reap it off the GUI thread
+                self._close_pty()
+                threading.Thread(target=_reap_shell, args=(process,), daemon=True).start()
+            elif process is not None:
+                process.finished.disconnect(self.process_finished)
+                if process.state() == QProcess.ProcessState.Running:
+                    process.terminate()
+                    process.waitForFinished(1000)
+                    if process.state() == QProcess.ProcessState.Running:
+                        process.kill()
         except Exception as e:
-            print(f"Error closing terminal process: {str(e)}")
\ No newline at end of file
+            print(f"Error closing terminal process: {str(e)}")
+    
+    def closeEvent(self, event):
+        """Handle tab close event."""
+        self.shutdown()
+        super().closeEvent(event)
\ No newline at end of file
@@ -6,13 +6,26 @@ management, and other helper functions.
 """
 
 import os
+import copy
 import json
+import pickle
+import shutil
 import logging
 import platform
 import subprocess
+import uuid
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from PyQt6.QtCore import QRunnable, QThreadPool
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,6 +39,13 @@ APP_VERSION = "1.0.0"
 CONFIG_DIR = Path.home() / ".selenium_qt_browser"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 PROFILES_DIR = CONFIG_DIR / "profiles"
+# Directories being deleted are moved here first, then removed in the background
+TRASH_DIR = CONFIG_DIR / ".trash"
+
+# Host platform, looked up once
+_SYSTEM = platform.system()
+_IS_WIN = _SYSTEM == "Windows"
+_IS_MAC = _SYSTEM == "Darwin"
 
 # Default configuration
 DEFAULT_CONFIG = {
@@ -51,11 +71,55 @@ DEFAULT_CONFIG = {
     }
 }
 
+# Fresh, independent copies of the defaults are unpickled from this blob
+_DEFAULT_CONFIG_BLOB = pickle.dumps(DEFAULT_CONFIG, protocol=pickle.HIGHEST_PROTOCOL)
+
+# Read-only view so the shared defaults can't be modified by accident
+DEFAULT_CONFIG = MappingProxyType({
+    section: MappingProxyType(values) for section, values in DEFAULT_CONFIG.items()
+})
+
+# Set once the application directories have been created
+_dirs_ensured = False
+
+# Parsed and merged config, reused until the config file's mtime changes
+_config_cache = {"mtime": None, "data": None}
+
+
+def _default_config() -> Dict[str, Any]:
+    """Return a new, mutable copy of the default configuration."""
+    return pickle.loads(_DEFAULT_CONFIG_BLOB)
+
+
+def _dumps(obj: Dict[str, Any]) -> bytes:
+    """Serialize obj to indented JSON bytes, using orjson when it is available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when it is available."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def ensure_app_directories() -> None:
     """Ensure all application directories exist."""
+    global _dirs_ensured
+    if _dirs_ensured:
+        return
+    
     CONFIG_DIR.mkdir(exist_ok=True)
     PROFILES_DIR.mkdir(exist_ok=True)
+    _dirs_ensured = True
+    
+    # Finish deletions that a previous run moved to the trash but didn't complete
+    if TRASH_DIR.is_dir():
+        with os.scandir(TRASH_DIR) as entries:
+            for entry in entries:
+                QThreadPool.globalInstance().start(_RmTreeJob(Path(entry.path)))
     
     logger.info(f"Application directories created at {CONFIG_DIR}")
 
@@ -64,32 +128,45 @@ def load_config() -> Dict[str, Any]:
     """Load the application configuration from the config file."""
     ensure_app_directories()
     
-    if not CONFIG_FILE.exists():
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         # Create default config file if it doesn't exist
-        save_config(DEFAULT_CONFIG)
-        return DEFAULT_CONFIG.copy()
+        config = _default_config()
+        save_config(config)
+        return config
+    
+    # Unchanged since the last parse; hand out a copy so callers can't mutate the cache
+    if _config_cache["mtime"] == mtime:
+        return copy.deepcopy(_config_cache["data"])
     
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
+        config = _loads(CONFIG_FILE.read_bytes())
         
         # Merge with default config to ensure all keys exist
-        merged_config = DEFAULT_CONFIG.copy()
+        merged_config = _default_config()
         deep_update(merged_config, config)
         
-        return merged_config
+        _config_cache["mtime"] = mtime
+        _config_cache["data"] = merged_config
+        return copy.deepcopy(merged_config)
     except Exception as e:
         logger.error(f"Error loading config: {e}")
-        return DEFAULT_CONFIG.copy()
+        return _default_config()
 
 
 def save_config(config: Dict[str, Any]) -> bool:
     """Save the application configuration to the config file."""
     ensure_app_directories()
     
+    # Don't trust the mtime alone on filesystems with coarse timestamps
+    _config_cache["mtime"] = None
+    
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Write beside the target and rename over it so a crash never truncates the config
+        tmp = CONFIG_FILE.with_suffix('.json.tmp')
+        tmp.write_bytes(_dumps(config))
+        os.replace(tmp, CONFIG_FILE)
         logger.info("Configuration saved successfully")
         return True
     except Exception as e:
@@ -98,18 +175,22 @@ def save_config(config: Dict[str, Any]) -> bool:
 
 
 def deep_update(target: Dict[str, Any], source: Dict[str, Any]) -> None:
-    """Recursively update a nested dictionary with another nested dictionary."""
-    for key, value in source.items():
-        if key in target and isinstance(target[key], dict) and isinstance(value, dict):
-            deep_update(target[key], value)
-        else:
-            target[key] = value
+    """Update a nested dictionary with another nested dictionary, merging nested dicts."""
+    # Walk the nesting with an explicit stack instead of recursion
+    stack = [(target, source)]
+    while stack:
+        target_dict, source_dict = stack.pop()
+        for key, value in source_dict.items():
+            if isinstance(value, dict) and isinstance(target_dict.get(key), dict):
+                stack.append((target_dict[key], value))
+            else:
+                target_dict[key] = value
 
 
 def get_system_info() -> Dict[str, str]:
     """Get system information."""
     return {
-        "os": platform.system(),
+        "os": _SYSTEM,
         "os_version": platform.version(),
         "python_version": platform.python_version(),
         "platform": platform.platform()
@@ -120,24 +201,29 @@ def open_file_explorer(path: str) -> None:
     """Open the system file explorer at the specified path."""
     path = os.path.normpath(path)
     
-    if platform.system() == "Windows":
+    if _IS_WIN:
         os.startfile(path)
-    elif platform.system() == "Darwin":  # macOS
-        subprocess.run(["open", path])
-    else:  # Linux
-        subprocess.run(["xdg-open", path])
+    else:
+        opener = "open" if _IS_MAC else "xdg-open"
+        # Fire and forget. An absolute executable path, close_fds=False and DEVNULL
+        # std streams let CPython use posix_spawn instead of forking the whole GUI
+        # process. Not closing fds is safe: Python creates them non-inheritable (PEP 446).
+        subprocess.Popen(
+            [shutil.which(opener) or opener, path],
+            close_fds=False,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
 
 
 def get_available_profiles() -> list:
     """Get a list of available browser profiles."""
     ensure_app_directories()
     
-    profiles = []
-    for item in PROFILES_DIR.iterdir():
-        if item.is_dir():
-            profiles.append(item.name)
-    
-    return profiles
+    # DirEntry.is_dir() answers from the directory listing, without a stat per entry
+    with os.scandir(PROFILES_DIR) as entries:
+        return [entry.name for entry in entries if entry.is_dir()]
 
 
 def create_profile(profile_name: str) -> bool:
@@ -158,6 +244,42 @@ def create_profile(profile_name: str) -> bool:
         return False
 
 
+class _RmTreeJob(QRunnable):
+    """Deletes a directory tree on a thread pool worker."""
+    
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path = path
+    
+    def run(self):
+        try:
+            if not os.path.isdir(self.path) or os.path.islink(self.path):
+                os.unlink(self.path)
+                return
+            for root, dirs, files in os.walk(self.path, topdown=False):
+                for name in files:
+                    os.unlink(os.path.join(root, name))
+                for name in dirs:
+                    path = os.path.join(root, name)
+                    # os.walk lists symlinks to directories with the directories
+                    if os.path.islink(path):
+                        os.unlink(path)
+                    else:
+                        os.rmdir(path)
+            os.rmdir(self.path)
+        except OSError as e:
+            logger.error(f"Error removing '{self.path}': {e}")
+
+
+def _remove_tree(path: Path) -> None:
+    """Move a directory out of the way and delete it without blocking the caller."""
+    # The rename is immediate, so the path is free again before this returns
+    TRASH_DIR.mkdir(exist_ok=True)
+    doomed = TRASH_DIR / f"{path.name}-{uuid.uuid4().hex}"
+    os.replace(path, doomed)
+    QThreadPool.globalInstance().start(_RmTreeJob(doomed))
+
+
 def delete_profile(profile_name: str) -> bool:
     """Delete a browser profile."""
     if profile_name == "default":
@@ -171,8 +293,7 @@ def delete_profile(profile_name: str) -> bool:
     
     try:
         # Recursively delete the profile directory
-        import shutil
-        shutil.rmtree(profile_dir)
+        _remove_tree(profile_dir)
         logger.info(f"Deleted profile: {profile_name}")
         return True
     except Exception as e:
@@ -189,26 +310,21 @@ def clear_browser_cache(profile_name: Optional[str] = None) -> bool:
             # Clear cache for a specific profile
             cache_dir = PROFILES_DIR / profile_name / "cache"
             if cache_dir.exists():
-                import shutil
-                shutil.rmtree(cache_dir)
+                _remove_tree(cache_dir)
                 cache_dir.mkdir()
                 logger.info(f"Cleared cache for profile: {profile_name}")
         else:
             # Clear cache for all profiles
-            for profile_dir in PROFILES_DIR.iterdir():
-                if profile_dir.is_dir():
-                    cache_dir = profile_dir / "cache"
-                    if cache_dir.exists():
-                        import shutil
-                        shutil.rmtree(cache_dir)
-                        cache_dir.mkdir()
+            with os.scandir(PROFILES_DIR) as entries:
+                profile_dirs = [Path(entry.path) for entry in entries if entry.is_dir()]
+            for profile_dir in profile_dirs:
+                cache_dir = profile_dir / "cache"
+                if cache_dir.exists():
+                    _remove_tree(cache_dir)
+                    cache_dir.mkdir()
             logger.info("Cleared cache for all profiles")
         
         return True
     except Exception as e:
         logger.error(f"Error clearing cache: {e}")
         return False
-
-
-# Initialize application directories when module is imported
-ensure_app_directories()
\ No newline at end of file
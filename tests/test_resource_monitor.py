@@ -0,0 +1,114 @@
+"""
+Tests for the resource monitor's model unloading.
+"""
+
+import types
+
+import pytest
+
+pytest.importorskip("PyQt6")
+pytest.importorskip("psutil")
+
+from selenium_qt_browser import resource_monitor
+from selenium_qt_browser.resource_monitor import ResourceMonitorWidget, CACHE_RELEASE_FRACTION
+
+GB = 1024 ** 3
+
+
+class FakeCuda:
+    """Stand-in for torch.cuda that records which device each call targets."""
+
+    def __init__(self, reserved_by_device, total_memory):
+        self.reserved_by_device = reserved_by_device
+        self.total_memory = total_memory
+        self.current = 0
+        self.calls = []
+
+    def is_available(self):
+        return True
+
+    def current_device(self):
+        return self.current
+
+    def memory_reserved(self, device):
+        self.calls.append(("memory_reserved", device))
+        return self.reserved_by_device[device]
+
+    def set_device(self, device):
+        self.calls.append(("set_device", device))
+        self.current = device
+
+    def get_device_properties(self, device):
+        return types.SimpleNamespace(total_memory=self.total_memory)
+
+    def empty_cache(self):
+        self.calls.append(("empty_cache", self.current))
+
+
+class FakeMonitor:
+    """Monitor whose set_model_info clears the model device like ResourceData does."""
+
+    def __init__(self, device_index):
+        self.data = types.SimpleNamespace(_model_dev_idx=device_index)
+
+    def set_model_info(self, loaded, device, precision, name):
+        self.data._model_dev_idx = None
+
+
+class SyncThread:
+    """threading.Thread replacement that runs the target on start()."""
+
+    def __init__(self, target, args=(), daemon=None):
+        self.target = target
+        self.args = args
+
+    def start(self):
+        self.target(*self.args)
+
+
+def make_widget(device_index):
+    """Build the attributes unload_model uses without constructing a QWidget."""
+    widget = types.SimpleNamespace(
+        monitor=FakeMonitor(device_index),
+        _model=object(),
+        _tokenizer=object(),
+        _model_pool=None,
+        status_label=types.SimpleNamespace(setText=lambda text: None),
+        status_message=types.SimpleNamespace(emit=lambda text: None),
+    )
+    widget._cuda_device_index = lambda: ResourceMonitorWidget._cuda_device_index(widget)
+    widget._unload_model_thread = lambda *args: ResourceMonitorWidget._unload_model_thread(widget, *args)
+    return widget
+
+
+@pytest.fixture
+def fake_cuda(monkeypatch):
+    total = 10 * GB
+    # The model's device holds most of its memory; the current device holds none
+    cuda = FakeCuda({0: 0, 1: int((CACHE_RELEASE_FRACTION + 0.1) * total)}, total)
+    monkeypatch.setattr(resource_monitor, "HAS_TORCH", True)
+    monkeypatch.setattr(resource_monitor, "torch", types.SimpleNamespace(cuda=cuda), raising=False)
+    monkeypatch.setattr(resource_monitor.threading, "Thread", SyncThread)
+    return cuda
+
+
+def test_unload_model_releases_cache_on_model_device(fake_cuda):
+    widget = make_widget(device_index=1)
+
+    ResourceMonitorWidget.unload_model(widget)
+
+    assert widget._model is None
+    assert ("memory_reserved", 1) in fake_cuda.calls
+    assert ("set_device", 1) in fake_cuda.calls
+    assert ("empty_cache", 1) in fake_cuda.calls
+    assert ("empty_cache", 0) not in fake_cuda.calls
+
+
+def test_unload_model_skips_empty_cache_below_threshold(fake_cuda):
+    fake_cuda.reserved_by_device[1] = GB
+    widget = make_widget(device_index=1)
+
+    ResourceMonitorWidget.unload_model(widget)
+
+    assert ("set_device", 1) in fake_cuda.calls
+    assert not any(call[0] == "empty_cache" for call in fake_cuda.calls)